@@ -4,13 +4,12 @@ AUTO-LOAD VERSION - Saves ALL words to Google Sheets
 """
 
 import streamlit as st
-import time
 
 # Safe imports
 try:
     from translator import get_translator
     from utils.language_utils import get_all_languages, get_language_display_name
-    from google_sheets_db import search_word, save_word, get_total_words
+    from dictionary_store import get_store
     HAS_SHEETS = True
 except ImportError as e:
     st.error(f"Import error: {e}")
@@ -64,6 +63,47 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHARED RESOURCES & CACHED READS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@st.cache_resource
+def load_translator(sarvam_key=None, hf_token=None):
+    """One translator (HTTP pool, caches, executor) per server process"""
+    return get_translator(sarvam_api_key=sarvam_key, huggingface_token=hf_token)
+
+@st.cache_resource
+def load_store():
+    """Local SQLite dictionary, synced with Google Sheets in the background"""
+    return get_store()
+
+# Reads take store.version, which every successful save bumps (including words
+# pulled from Sheets), so reruns hit the database only when the data changed.
+@st.cache_data(ttl=600, show_spinner=False)
+def cached_count(version):
+    return store.count()
+
+@st.cache_data(ttl=600, max_entries=5000, show_spinner=False)
+def cached_lookup(word, version):
+    return store.lookup(word)
+
+@st.cache_data(ttl=600, max_entries=1000, show_spinner=False)
+def cached_reverse_lookup(word, version):
+    return store.reverse_lookup(word)
+
+@st.cache_data(ttl=600, max_entries=1000, show_spinner=False)
+def cached_suggest(word, version):
+    return store.suggest(word)
+
+@st.cache_data(ttl=15, show_spinner=False)
+def cached_sync_status():
+    """Replica counters change in the background, so these are only TTL-bounded"""
+    replica = dict(store.replica.stats) if store.replica else {}
+    replica["pending"] = len(store.outbox())
+    return replica
+
+store = load_store()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # AUTO-INITIALIZE TRANSLATOR (NO SETUP PAGE!)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -85,10 +125,7 @@ if 'translator' not in st.session_state:
             pass
         
         # Initialize translator automatically
-        st.session_state.translator = get_translator(
-            sarvam_api_key=sarvam_key,
-            huggingface_token=hf_token
-        )
+        st.session_state.translator = load_translator(sarvam_key, hf_token)
         
         st.session_state.has_sarvam = bool(sarvam_key)
         st.session_state.has_hf = bool(hf_token)
@@ -96,7 +133,7 @@ if 'translator' not in st.session_state:
     except Exception as e:
         st.error(f"Initialization error: {e}")
         # Fallback to no API keys
-        st.session_state.translator = get_translator()
+        st.session_state.translator = load_translator()
         st.session_state.has_sarvam = False
         st.session_state.has_hf = False
 
@@ -113,7 +150,7 @@ st.markdown('<p class="subtitle">22 Languages • Auto-Save ALL Words</p>', unsa
 # TABS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-tab1, tab2 = st.tabs(["📖 Dictionary", "📊 Database"])
+tab1, tab2, tab3 = st.tabs(["📖 Dictionary", "📊 Database", "✍️ Translate Text"])
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 1: DICTIONARY - AUTO-SAVE ALL WORDS
@@ -123,12 +160,20 @@ with tab1:
     st.markdown("## 📖 Smart Dictionary")
     st.info("🎯 Search any word - **Automatically saves ALL words** to Google Sheets!")
     
+    search_mode = st.radio(
+        "Search by:",
+        ["English", "Native script"],
+        horizontal=True,
+        key="search_mode"
+    )
+    native_mode = search_mode == "Native script"
+    
     col1, col2 = st.columns([4, 1])
     
     with col1:
         search_word_input = st.text_input(
-            "Enter English word:",
-            placeholder="e.g., potato, butterfly, computer...",
+            "Enter a word in any Indian language:" if native_mode else "Enter English word:",
+            placeholder="e.g., आलू, உருளைக்கிழங்கு, আলু..." if native_mode else "e.g., potato, butterfly, computer...",
             key="dict_search"
         )
     
@@ -137,16 +182,44 @@ with tab1:
         st.write("")
         search_btn = st.button("🔍 Search", key="search", use_container_width=True, type="primary")
     
-    if search_btn and search_word_input:
+    if search_btn and search_word_input and native_mode:
+        # Reverse lookup: native-script word -> English entries
+        with st.spinner("🔍 Searching database..."):
+            matches = cached_reverse_lookup(search_word_input.strip(), store.version)
+        
+        if not matches:
+            st.warning(f"⚠️ '{search_word_input.strip()}' not found in any language.")
+        else:
+            st.success(f"✅ {len(matches)} match(es) found!")
+            for match in matches:
+                lang = match['matched_language'].title()
+                st.markdown(f"### 🔤 {match['english'].title()}")
+                st.caption(
+                    f"📂 Category: {match.get('category') or 'general'} · "
+                    f"matched {lang} ({get_language_display_name(lang)})"
+                    + (" · partial match" if match['match'] == "prefix" else "")
+                )
+                cols = st.columns(3)
+                shown = [l for l in get_all_languages() if match.get(l.lower())]
+                for idx, other in enumerate(shown):
+                    with cols[idx % 3]:
+                        st.markdown(f"""
+                        <div class="translation-box">
+                            <strong>{other}</strong> ({get_language_display_name(other)})<br>
+                            <span class="translation-text">{match[other.lower()]}</span>
+                        </div>
+                        """, unsafe_allow_html=True)
+    
+    elif search_btn and search_word_input:
         search_word_input = search_word_input.strip().lower()
         
-        # Search in Google Sheets
+        # Search the local dictionary (Google Sheets is synced in the background)
         with st.spinner("🔍 Searching database..."):
-            result = search_word(search_word_input)
+            result = cached_lookup(search_word_input, store.version)
         
         if result:
             # Found in database
-            st.success("✅ Found in Google Sheets database!")
+            st.success("✅ Found in dictionary database!")
             
             english = result.get('english', search_word_input)
             category = result.get('category', 'general')
@@ -180,6 +253,10 @@ with tab1:
             # Not in database - Translate & AUTO-SAVE ALL
             st.warning(f"⚠️ '{search_word_input}' not in database. Translating...")
             
+            suggestions = cached_suggest(search_word_input, store.version)
+            if suggestions:
+                st.caption("💡 Did you mean: " + ", ".join(suggestions))
+            
             progress_bar = st.progress(0)
             status_text = st.empty()
             
@@ -192,13 +269,25 @@ with tab1:
             translation_methods = {}
             success_count = 0
             
-            # Translate all 22 languages
+            # One placeholder card per language, filled in as results arrive
+            cards = {}
             for idx, lang in enumerate(languages):
-                status_text.text(f"Translating to {lang}... ({idx+1}/22)")
+                with cols[idx % 3]:
+                    cards[lang] = st.empty()
+                    cards[lang].markdown(f"""
+                    <div class="translation-box" style="border-left-color: #d1d5db;">
+                        <strong>{lang}</strong> ({get_language_display_name(lang)})<br>
+                        <span class="translation-text" style="color: #999;">⏳</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+            
+            # Translate all 22 languages concurrently
+            status_text.text(f"Translating to {len(languages)} languages...")
+            
+            for done, (lang, result_text, method) in enumerate(translator.iter_translations(search_word_input, languages), start=1):
+                status_text.text(f"Translated {lang} ({done}/22)")
                 
                 try:
-                    result_text, method = translator.translate(search_word_input, lang)
-                    
                     # Check if translation successful
                     is_success = not (
                         result_text.startswith("Translation unavailable") or
@@ -213,36 +302,35 @@ with tab1:
                         success_count += 1
                     
                     # Display translation
-                    with cols[idx % 3]:
-                        native = get_language_display_name(lang)
-                        
-                        badge_info = {
-                            "sarvam": ("🥇 Sarvam", "#10b981"),
-                            "indictrans": ("🥈 IndicTrans", "#3b82f6"),
-                            "fallback": ("🥉 Fallback", "#f59e0b")
-                        }
-                        badge_text, badge_color = badge_info.get(method, ("❓", "#6b7280"))
-                        
-                        quality_icon = "✅" if is_success else "⚠️"
-                        border_color = "#10b981" if is_success else "#ef4444"
-                        
-                        st.markdown(f"""
-                        <div class="translation-box" style="border-left-color: {border_color};">
-                            <strong>{lang}</strong> ({native})
-                            <span style="display: inline-block; padding: 0.2rem 0.6rem; 
-                                         background: {badge_color}; color: white; border-radius: 8px; 
-                                         font-size: 0.7rem; margin-left: 0.3rem; font-weight: 600;">
-                                {badge_text}
-                            </span>
-                            <span style="margin-left: 0.3rem; font-size: 1.2rem;">{quality_icon}</span><br>
-                            <span class="translation-text" style="color: {'#2d3748' if is_success else '#999'};">
-                                {result_text}
-                            </span>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    native = get_language_display_name(lang)
+                    
+                    badge_info = {
+                        "sarvam": ("🥇 Sarvam", "#10b981"),
+                        "indictrans": ("🥈 IndicTrans", "#3b82f6"),
+                        "fallback": ("🥉 Fallback", "#f59e0b"),
+                        "approximate": ("≈ Singular", "#a855f7")
+                    }
+                    badge_text, badge_color = badge_info.get(method, ("❓", "#6b7280"))
+                    
+                    quality_icon = "✅" if is_success else "⚠️"
+                    border_color = "#10b981" if is_success else "#ef4444"
+                    
+                    cards[lang].markdown(f"""
+                    <div class="translation-box" style="border-left-color: {border_color};">
+                        <strong>{lang}</strong> ({native})
+                        <span style="display: inline-block; padding: 0.2rem 0.6rem; 
+                                     background: {badge_color}; color: white; border-radius: 8px; 
+                                     font-size: 0.7rem; margin-left: 0.3rem; font-weight: 600;">
+                            {badge_text}
+                        </span>
+                        <span style="margin-left: 0.3rem; font-size: 1.2rem;">{quality_icon}</span><br>
+                        <span class="translation-text" style="color: {'#2d3748' if is_success else '#999'};">
+                            {result_text}
+                        </span>
+                    </div>
+                    """, unsafe_allow_html=True)
                     
-                    progress_bar.progress((idx + 1) / 22)
-                    time.sleep(0.12)
+                    progress_bar.progress(done / 22)
                 
                 except Exception as e:
                     st.error(f"Error translating {lang}: {e}")
@@ -267,26 +355,32 @@ with tab1:
             st.markdown("---")
             st.info("💾 Auto-saving ALL words to database...")
             
-            with st.spinner("💾 Saving to Google Sheets..."):
+            with st.spinner("💾 Saving to database..."):
                 try:
                     # Prepare translations dict - SAVE EVERYTHING including failed ones
                     translations_to_save = {}
                     for lang in languages:
                         db_key = lang.lower()
                         trans = all_translations.get(lang, "")
+                        if translation_methods.get(lang) == "approximate":
+                            # The singular's translation, not this word's
+                            trans = ""
                         # Save even if empty or failed - just save what we got
                         translations_to_save[db_key] = trans
                     
-                    # Save to Google Sheets
-                    if save_word(search_word_input, "general", translations_to_save):
+                    # Save locally; the replica pushes it to Google Sheets
+                    if store.save(search_word_input, "general", translations_to_save):
                         st.success(f"✅ SAVED: '{search_word_input}' with {success_count}/22 translations!")
                         st.balloons()
                         
                         try:
-                            total = get_total_words()
+                            total = cached_count(store.version)
                             st.info(f"📊 Database now has {total} words!")
                         except:
                             st.info("📊 Saved successfully!")
+                    elif cached_lookup(search_word_input, store.version):
+                        # Another session searched the same word and saved it first
+                        st.success(f"✅ '{search_word_input}' is already saved in the dictionary!")
                     else:
                         st.warning("⚠️ Word may already exist in database")
                 
@@ -305,7 +399,7 @@ with tab2:
     
     with col1:
         try:
-            word_count = get_total_words()
+            word_count = cached_count(store.version)
             st.metric("📚 Total Words", word_count)
         except:
             st.metric("📚 Total Words", "N/A")
@@ -331,7 +425,11 @@ with tab2:
         st.info("🥈 IndicTrans2 - Not configured")
     
     st.success("🥉 Fallback - Always Active (Common words)")
-    st.success("☁️ Google Sheets - Connected")
+    replica = cached_sync_status()
+    if replica.get("last_sync"):
+        st.success(f"☁️ Google Sheets - Synced (↑ {replica['pushed']} / ↓ {replica['pulled']}, {replica['pending']} pending)")
+    else:
+        st.info("☁️ Google Sheets - Waiting for first sync")
     
     st.markdown("---")
     
@@ -352,6 +450,45 @@ with tab2:
     except:
         st.info("No statistics yet")
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# TAB 3: FREE TEXT - STREAMED TRANSLATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+with tab3:
+    st.markdown("## ✍️ Translate Text")
+    st.info("📝 Translate sentences - the translation appears word by word as it is generated")
+    
+    source_text = st.text_area(
+        "Enter English text:",
+        placeholder="e.g., The weather is lovely today.",
+        key="stream_text"
+    )
+    
+    col1, col2 = st.columns([4, 1])
+    
+    with col1:
+        target_language = st.selectbox(
+            "Target language:",
+            get_all_languages(),
+            format_func=lambda lang: f"{lang} ({get_language_display_name(lang)})",
+            key="stream_lang"
+        )
+    
+    with col2:
+        st.write("")
+        st.write("")
+        stream_btn = st.button("🚀 Translate", key="stream", use_container_width=True, type="primary")
+    
+    if stream_btn and source_text.strip():
+        output = st.empty()
+        for partial in translator.translate_stream(source_text, target_language):
+            output.markdown(f"""
+            <div class="translation-box">
+                <strong>{target_language}</strong> ({get_language_display_name(target_language)})<br>
+                <span class="translation-text">{partial}</span>
+            </div>
+            """, unsafe_allow_html=True)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SIDEBAR
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -360,7 +497,7 @@ with st.sidebar:
     st.markdown("## 🌟 Status")
     
     try:
-        count = get_total_words()
+        count = cached_count(store.version)
         st.metric("Words", count)
     except:
         st.metric("Words", "N/A")
@@ -0,0 +1,157 @@
+"""
+Backend Pool Check
+Exercise BackendPool against local stub servers: failover, circuit breaker
+open / half-open, and a hedged request winning over a slow backend
+
+Needs nothing but the standard library; exits non-zero if a check fails.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sarvam_backends import BackendPool, NoHealthyBackend
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.hits += 1
+        time.sleep(self.server.delay)
+        body = json.dumps({"success": self.server.status < 500, "translation": self.server.name}).encode("utf-8")
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    """A fake Sarvam server whose status code and delay can be changed mid-check"""
+
+    daemon_threads = True
+
+    def __init__(self, name, status=200, delay=0.0):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.name = name
+        self.status = status
+        self.delay = delay
+        self.hits = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class StubResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+    def close(self):
+        pass
+
+def send(base_url):
+    """POST /translate the way the translator does, as a requests-like response"""
+    request = urllib.request.Request(f"{base_url}/translate", data=b'{"text": "water"}', method="POST",
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return StubResponse(response.status, response.read())
+    except urllib.error.HTTPError as e:
+        return StubResponse(e.code, e.read())
+
+def translation(pool, hedge=True):
+    return pool.call(send, hedge=hedge).json()["translation"]
+
+def check_failover():
+    down, up = StubServer("down", status=503), StubServer("up")
+    pool = BackendPool([down.url, up.url], failure_threshold=100)
+    # Make the failing server the primary: failures do not update its recorded latency
+    pool.backends[0].ewma_ms, pool.backends[1].ewma_ms = 1.0, 1e6
+    answers = {translation(pool) for _ in range(10)}
+    assert answers == {"up"}, answers
+    assert pool.get_stats()["failovers"] == down.hits > 0, pool.get_stats()
+    return f"{down.hits} call(s) failed over from the 503 backend"
+
+def check_breaker():
+    flaky, steady = StubServer("flaky", status=500), StubServer("steady")
+    pool = BackendPool([flaky.url, steady.url], failure_threshold=2, reset_timeout=0.5)
+    backend = pool.backends[0]
+    backend.ewma_ms, pool.backends[1].ewma_ms = 1.0, 1e6
+    while backend.state == "closed":
+        translation(pool)
+    assert backend.state == "open", backend.state
+
+    hits = flaky.hits
+    for _ in range(10):
+        assert translation(pool) == "steady"
+    assert flaky.hits == hits, "open breaker still sent traffic"
+
+    # Still failing after reset_timeout: the single probe re-opens the breaker
+    time.sleep(0.6)
+    assert backend.state == "half-open", backend.state
+    translation(pool)
+    assert flaky.hits == hits + 1 and backend.state == "open", (flaky.hits, backend.state)
+
+    # Recovered: the probe goes first and closes the breaker
+    flaky.status = 200
+    time.sleep(0.6)
+    assert translation(pool) == "flaky" and backend.state == "closed", backend.state
+    return "opened after 2 failures, skipped while open, probe re-opened then closed it"
+
+def check_hedge():
+    slow, fast = StubServer("slow"), StubServer("fast")
+    pool = BackendPool([slow.url, fast.url], hedge_percentile=95, min_samples=20)
+    for _ in range(pool.min_samples):
+        translation(pool, hedge=False)
+    delay = pool.hedge_delay()
+    assert delay is not None
+
+    slow.delay = 1.0
+    # Make the slow server the primary: its recorded latency says it is the fastest
+    pool.backends[0].ewma_ms, pool.backends[1].ewma_ms = 1.0, 1e6
+    started = time.perf_counter()
+    answer = translation(pool)
+    elapsed = time.perf_counter() - started
+    stats = pool.get_stats()
+    assert answer == "fast" and stats["hedges"] == 1 and stats["hedge_wins"] == 1, (answer, stats)
+    assert elapsed < slow.delay, elapsed
+    return f"hedged after {delay * 1000:.0f} ms, answered in {elapsed * 1000:.0f} ms instead of {slow.delay * 1000:.0f}"
+
+def check_all_down():
+    pool = BackendPool([StubServer("down", status=500).url], failure_threshold=1, reset_timeout=60)
+    translation(pool)
+    try:
+        translation(pool)
+    except NoHealthyBackend:
+        return "NoHealthyBackend once every breaker is open"
+    raise AssertionError("expected NoHealthyBackend")
+
+CHECKS = [check_failover, check_breaker, check_hedge, check_all_down]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check BackendPool failover, circuit breaking and hedging against stub servers")
+    parser.add_argument("checks", nargs="*", help="checks to run (default: all)")
+    args = parser.parse_args()
+
+    failed = 0
+    for check in CHECKS:
+        name = check.__name__[len("check_"):]
+        if args.checks and name not in args.checks:
+            continue
+        try:
+            print(f"✅ {name}: {check()}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,188 @@
+"""
+Dictionary Artifact
+Compile the dictionary into one read-only, memory-mapped file
+
+Layout (little-endian):
+    header    magic, word count, column count, metadata length
+    metadata  JSON: columns (category + languages), source, built_at
+    offsets   (words + 1) uint32 key offsets, then (words + 1) uint32 offsets per column
+    keys      english words, UTF-8, sorted bytewise
+    values    column values, UTF-8, one run per column
+
+Lookups binary-search the key offsets straight out of the mapping, so
+opening is O(1) and every process mapping the file shares the same pages.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+
+from dictionary_builder import LANGUAGE_COLUMNS
+
+MAGIC = b"MLDICT01"
+HEADER = struct.Struct("<8sIII")  # magic, n_words, n_columns, metadata length
+
+def build_artifact(db_path="data/dictionary.db", out_path="data/dictionary.artifact", languages=LANGUAGE_COLUMNS):
+    """Write out_path from the words table; returns {"words", "bytes", "seconds"}"""
+    started = time.perf_counter()
+    columns = ["category"] + list(languages)
+    conn = sqlite3.connect(db_path)
+    # BINARY collation compares UTF-8 bytes, the same order the loader searches in
+    rows = conn.execute(f'SELECT english, {", ".join(columns)} FROM words ORDER BY english')
+
+    key_offsets = array("I", [0])
+    value_offsets = [array("I", [0]) for _ in columns]
+    keys = bytearray()
+    values = [bytearray() for _ in columns]
+    for row in rows:
+        keys += row[0].encode("utf-8")
+        key_offsets.append(len(keys))
+        for i, text in enumerate(row[1:]):
+            if text:
+                values[i] += text.encode("utf-8")
+            value_offsets[i].append(len(values[i]))
+    conn.close()
+
+    # Every column's values are laid out back to back; shift offsets to be relative to the values section
+    base = 0
+    for i, offsets in enumerate(value_offsets):
+        if base:
+            value_offsets[i] = array("I", (offset + base for offset in offsets))
+        base += len(values[i])
+    if max(len(keys), base) >= 2 ** 32:
+        raise ValueError("Dictionary too large for 32-bit artifact offsets")
+
+    metadata = json.dumps({
+        "columns": columns,
+        "source": os.path.basename(db_path),
+        "built_at": time.time()
+    }).encode("utf-8")
+    metadata += b" " * (-len(metadata) % 4)  # keep the offset arrays 4-byte aligned
+
+    n_words = len(key_offsets) - 1
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, n_words, len(columns), len(metadata)))
+        f.write(metadata)
+        for offsets in [key_offsets] + value_offsets:
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            f.write(offsets.tobytes())
+        f.write(keys)
+        for blob in values:
+            f.write(blob)
+    # Readers that already mapped the old file keep using it until they reopen
+    os.replace(tmp, out_path)
+
+    size = os.path.getsize(out_path)
+    seconds = time.perf_counter() - started
+    print(f"✅ Built {out_path}: {n_words:,} words, {size / 1024:,.0f} KB in {seconds:.1f}s")
+    return {"words": n_words, "bytes": size, "seconds": round(seconds, 2)}
+
+class DictionaryArtifact:
+    """Read-only dictionary over a memory-mapped artifact
+
+    get_translation / get_word mirror DictionaryBuilder, without a
+    database connection or per-entry Python objects.
+    """
+
+    def __init__(self, path="data/dictionary.artifact"):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_words, n_columns, meta_len = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a dictionary artifact")
+        start = HEADER.size
+        self.metadata = json.loads(bytes(self.mm[start:start + meta_len]))
+        self.columns = self.metadata["columns"]
+        self.column_index = {column: i for i, column in enumerate(self.columns)}
+
+        view = memoryview(self.mm)
+        table = (self.n_words + 1) * 4
+        start += meta_len
+        if sys.byteorder == "little":
+            offsets = view[start:start + table * (n_columns + 1)].cast("I")
+        else:
+            offsets = array("I", view[start:start + table * (n_columns + 1)])
+            offsets.byteswap()
+        self.offsets = offsets
+        self.keys_start = start + table * (n_columns + 1)
+        self.values_start = self.keys_start + self.offsets[self.n_words]
+
+    def __len__(self):
+        return self.n_words
+
+    def __contains__(self, english_word):
+        return self._find(english_word) is not None
+
+    def _key(self, i):
+        return self.mm[self.keys_start + self.offsets[i]:self.keys_start + self.offsets[i + 1]]
+
+    def _lower_bound(self, target):
+        lo, hi = 0, self.n_words
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, english_word):
+        target = english_word.encode("utf-8")
+        i = self._lower_bound(target)
+        return i if i < self.n_words and self._key(i) == target else None
+
+    def _value(self, i, column):
+        base = (column + 1) * (self.n_words + 1)
+        start, end = self.offsets[base + i], self.offsets[base + i + 1]
+        return self.mm[self.values_start + start:self.values_start + end].decode("utf-8")
+
+    def get_translation(self, english_word, language):
+        """Get specific language translation"""
+        column = self.column_index.get(language.lower())
+        i = self._find(english_word)
+        if column is None or i is None:
+            return None
+        return self._value(i, column)
+
+    def get_word(self, english_word):
+        """Exact lookup; returns {column: value} like DictionaryBuilder.get_word, or None"""
+        i = self._find(english_word)
+        if i is None:
+            return None
+        record = {"english": english_word}
+        record.update((column, self._value(i, n)) for n, column in enumerate(self.columns))
+        return record
+
+    def prefix(self, prefix, limit=10):
+        """English words starting with prefix, in sorted order"""
+        target = prefix.encode("utf-8")
+        i = self._lower_bound(target)
+        words = []
+        while i < self.n_words and len(words) < limit:
+            key = self._key(i)
+            if not key.startswith(target):
+                break
+            words.append(key.decode("utf-8"))
+            i += 1
+        return words
+
+    def close(self):
+        self.offsets = None
+        self.mm.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the dictionary into a memory-mapped artifact")
+    parser.add_argument("--db", default="data/dictionary.db", help="dictionary database")
+    parser.add_argument("--out", default="data/dictionary.artifact", help="artifact to write")
+    args = parser.parse_args()
+
+    build_artifact(args.db, args.out)
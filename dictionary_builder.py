@@ -4,19 +4,88 @@ SQLite database for multilingual dictionary
 """
 
 import sqlite3
-import json
 import os
+import re
+import threading
+import weakref
+
+from dictionary_search import DictionarySearch, create_search_index, create_suggest_index, index_deletes, unindex_deletes
+from utils.language_utils import fold_native, get_all_languages
+
+LANGUAGE_COLUMNS = [lang.lower() for lang in get_all_languages()]
+WORD_COLUMNS = ["english", "category"] + LANGUAGE_COLUMNS
+VARIANT_SEPARATORS = re.compile(r"[,;/|]")
+REPLACE_SQL = f'INSERT OR REPLACE INTO words ({", ".join(WORD_COLUMNS)}) VALUES ({", ".join("?" * len(WORD_COLUMNS))})'
+
+def translation_values(translations):
+    """Per-language values in LANGUAGE_COLUMNS order; keys may be 'Hindi' or 'hindi'"""
+    return [translations.get(col) or translations.get(col.title()) or '' for col in LANGUAGE_COLUMNS]
+
+def native_forms(values):
+    """(language, folded form) pairs to index for one word's translation values
+
+    A cell may hold several variants ("पानी, जल"); each is indexed separately.
+    """
+    forms = set()
+    for lang, value in zip(LANGUAGE_COLUMNS, values):
+        if not value:
+            continue
+        for variant in VARIANT_SEPARATORS.split(value):
+            form = fold_native(variant)
+            if form:
+                forms.add((lang, form))
+    return forms
+
+class _ThreadConnection:
+    """Holds one thread's connection in its threading.local; dropped when the thread exits"""
+    
+    def __init__(self, conn):
+        self.conn = conn
+
+def _close_connection(connections, lock, conn):
+    with lock:
+        connections.discard(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
 
 class DictionaryBuilder:
     def __init__(self, db_path="data/dictionary.db"):
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = None
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._local = threading.local()
+        self._connections = set()
+        # Reentrant: a thread's exit hook can run inside a garbage collection that this lock's holder triggered
+        self._lock = threading.RLock()
+        self._search = None
         self.create_database()
     
+    @property
+    def conn(self):
+        """This thread's connection, closed again when the thread exits
+        
+        Streamlit runs every rerun on a fresh thread, so connections must not
+        outlive their thread. check_same_thread=False only lets close() and the
+        exit hook close them from elsewhere; each is still used by one thread.
+        """
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=256, check_same_thread=False)
+            # WAL lets readers run alongside the single writer
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # INSERT OR REPLACE must fire the delete trigger that keeps words_fts in sync
+            conn.execute("PRAGMA recursive_triggers=ON")
+            holder = self._local.holder = _ThreadConnection(conn)
+            with self._lock:
+                self._connections.add(conn)
+            weakref.finalize(holder, _close_connection, self._connections, self._lock, conn)
+        return holder.conn
+    
     def create_database(self):
         """Create dictionary database"""
-        self.conn = sqlite3.connect(self.db_path)
         cursor = self.conn.cursor()
         
         # Create words table
@@ -51,64 +120,63 @@ class DictionaryBuilder:
             )
         ''')
         
+        # Reverse index: folded native-script form -> word, maintained by add_word/load_from_json
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS word_forms (
+                lang TEXT NOT NULL,
+                form TEXT NOT NULL,
+                word_id INTEGER NOT NULL,
+                PRIMARY KEY (lang, form, word_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_forms_form ON word_forms(form)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_forms_word ON word_forms(word_id)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS word_forms_delete AFTER DELETE ON words BEGIN
+                DELETE FROM word_forms WHERE word_id = old.id;
+            END
+        ''')
+        
         self.conn.commit()
+        if cursor.execute('SELECT 1 FROM word_forms LIMIT 1').fetchone() is None:
+            self.rebuild_forms()
+        create_search_index(self.conn)
+        create_suggest_index(self.conn)
         print("✅ Database created")
     
-    def load_from_json(self, json_path="data/common_words.json"):
-        """Load words from JSON file"""
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+    def _index_forms(self, cursor, word_id, values):
+        cursor.execute('DELETE FROM word_forms WHERE word_id = ?', (word_id,))
+        cursor.executemany('INSERT OR IGNORE INTO word_forms (lang, form, word_id) VALUES (?, ?, ?)',
+                           [(lang, form, word_id) for lang, form in native_forms(values)])
+    
+    def rebuild_forms(self):
+        """Re-derive word_forms from the words table (after a bulk change or a folding rule change)"""
         cursor = self.conn.cursor()
-        count = 0
-        
-        for category, words in data.items():
-            for english, translations in words.items():
-                try:
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO words (
-                            english, category, hindi, bengali, tamil, telugu,
-                            malayalam, kannada, marathi, gujarati, odia, punjabi,
-                            assamese, urdu, maithili, sanskrit, konkani, nepali,
-                            sindhi, dogri, manipuri, bodo, kashmiri, santali
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        english, category,
-                        translations.get('hindi', ''),
-                        translations.get('bengali', ''),
-                        translations.get('tamil', ''),
-                        translations.get('telugu', ''),
-                        translations.get('malayalam', ''),
-                        translations.get('kannada', ''),
-                        translations.get('marathi', ''),
-                        translations.get('gujarati', ''),
-                        translations.get('odia', ''),
-                        translations.get('punjabi', ''),
-                        translations.get('assamese', ''),
-                        translations.get('urdu', ''),
-                        translations.get('maithili', ''),
-                        translations.get('sanskrit', ''),
-                        translations.get('konkani', ''),
-                        translations.get('nepali', ''),
-                        translations.get('sindhi', ''),
-                        translations.get('dogri', ''),
-                        translations.get('manipuri', ''),
-                        translations.get('bodo', ''),
-                        translations.get('kashmiri', ''),
-                        translations.get('santali', '')
-                    ))
-                    count += 1
-                except Exception as e:
-                    print(f"Error inserting {english}: {e}")
-        
+        cursor.execute('DELETE FROM word_forms')
+        rows = cursor.execute(f'SELECT id, {", ".join(LANGUAGE_COLUMNS)} FROM words').fetchall()
+        for row in rows:
+            self._index_forms(cursor, row[0], row[1:])
         self.conn.commit()
-        print(f"✅ Loaded {count} words")
     
-    def search_word(self, english_word):
-        """Search for a word"""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM words WHERE english LIKE ?', (f'%{english_word}%',))
-        return cursor.fetchall()
+    def load_from_json(self, json_path="data/common_words.json"):
+        """Load words from a JSON, JSONL or CSV wordlist, merging into existing entries"""
+        from dictionary_importer import import_file  # deferred: dictionary_importer imports this module
+        return import_file(self, json_path)["rows"]
+    
+    @property
+    def search(self):
+        """DictionarySearch over this database, created on first use"""
+        if self._search is None:
+            self._search = DictionarySearch(self)
+        return self._search
+    
+    def search_word(self, english_word, limit=20):
+        """Search for a word: exact, prefix, substring, then fuzzy matches"""
+        return self.search.search(english_word, limit)
+    
+    def suggest(self, english_word, limit=5):
+        """'Did you mean' candidates for a word that is not in the dictionary"""
+        return self.search.suggest(english_word, limit=limit)
     
     def get_translation(self, english_word, language):
         """Get specific language translation"""
@@ -118,42 +186,57 @@ class DictionaryBuilder:
         result = cursor.fetchone()
         return result[0] if result else None
     
+    def get_word(self, english_word):
+        """Exact lookup; returns {column: value} like a sheet record, or None"""
+        cursor = self.conn.cursor()
+        cursor.execute(f'SELECT {", ".join(WORD_COLUMNS)} FROM words WHERE english = ?', (english_word,))
+        row = cursor.fetchone()
+        return dict(zip(WORD_COLUMNS, row)) if row else None
+    
+    def reverse_lookup(self, native_word, language=None, limit=20):
+        """Find English words by a translation in any (or one) of the 22 languages
+
+        Matches on the folded form, exact matches before prefix matches.
+        Each record gains 'matched_language' and 'match' keys.
+        """
+        form = fold_native(native_word)
+        if not form:
+            return []
+        lang_filter = 'AND f.lang = ?' if language else ''
+        lang_params = (language.lower(),) if language else ()
+        columns = ", ".join("w." + c for c in WORD_COLUMNS)
+        results, seen = [], set()
+        for match, condition, params in (
+            ("exact", 'f.form = ?', (form,)),
+            # U+10FFFF sorts after every other character, so this is a range scan on form
+            ("prefix", 'f.form > ? AND f.form < ?', (form, form + "\U0010ffff")),
+        ):
+            rows = self.conn.execute(f'''
+                SELECT {columns}, f.lang FROM word_forms f JOIN words w ON w.id = f.word_id
+                WHERE {condition} {lang_filter} ORDER BY length(f.form), w.english LIMIT ?
+            ''', params + lang_params + (limit,)).fetchall()
+            for row in rows:
+                if len(results) < limit and row[0] not in seen:
+                    seen.add(row[0])
+                    results.append(dict(zip(WORD_COLUMNS, row), matched_language=row[-1], match=match))
+        return results
+    
+    def count_words(self):
+        """Number of words in the dictionary"""
+        return self.conn.execute('SELECT COUNT(*) FROM words').fetchone()[0]
+    
     def add_word(self, english, translations, category="general"):
         """Add new word to dictionary"""
         cursor = self.conn.cursor()
+        values = translation_values(translations)
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO words (
-                    english, category, hindi, bengali, tamil, telugu,
-                    malayalam, kannada, marathi, gujarati, odia, punjabi,
-                    assamese, urdu, maithili, sanskrit, konkani, nepali,
-                    sindhi, dogri, manipuri, bodo, kashmiri, santali
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                english, category,
-                translations.get('Hindi', ''),
-                translations.get('Bengali', ''),
-                translations.get('Tamil', ''),
-                translations.get('Telugu', ''),
-                translations.get('Malayalam', ''),
-                translations.get('Kannada', ''),
-                translations.get('Marathi', ''),
-                translations.get('Gujarati', ''),
-                translations.get('Odia', ''),
-                translations.get('Punjabi', ''),
-                translations.get('Assamese', ''),
-                translations.get('Urdu', ''),
-                translations.get('Maithili', ''),
-                translations.get('Sanskrit', ''),
-                translations.get('Konkani', ''),
-                translations.get('Nepali', ''),
-                translations.get('Sindhi', ''),
-                translations.get('Dogri', ''),
-                translations.get('Manipuri', ''),
-                translations.get('Bodo', ''),
-                translations.get('Kashmiri', ''),
-                translations.get('Santali', '')
-            ))
+            # REPLACE gives the word a new id; drop the old id's suggestion rows first
+            old = cursor.execute('SELECT id FROM words WHERE english = ?', (english,)).fetchone()
+            if old:
+                unindex_deletes(cursor, [(old[0], english)])
+            cursor.execute(REPLACE_SQL, [english, category] + values)
+            self._index_forms(cursor, cursor.lastrowid, values)
+            index_deletes(cursor, [(cursor.lastrowid, english)])
             self.conn.commit()
             return True
         except Exception as e:
@@ -161,9 +244,13 @@ class DictionaryBuilder:
             return False
     
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close every thread's database connection"""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
 
 # Initialize database
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+"""
+Dictionary Importer
+Stream JSON, JSONL or CSV wordlists into the SQLite dictionary in bulk
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from dictionary_builder import DictionaryBuilder, LANGUAGE_COLUMNS, native_forms
+from dictionary_search import index_deletes
+
+BATCH_SIZE = 20000        # rows per executemany / transaction
+PROGRESS_EVERY = 100000   # rows between progress lines
+READ_CHUNK = 1 << 20      # bytes read from a JSON file at a time
+
+UPSERT_SQL = f'''
+    INSERT INTO words (english, category, {", ".join(LANGUAGE_COLUMNS)})
+    VALUES (?, NULLIF(?, ''), {", ".join("?" * len(LANGUAGE_COLUMNS))})
+    ON CONFLICT(english) DO UPDATE SET
+        {", ".join(f"{col} = COALESCE(NULLIF(excluded.{col}, ''), words.{col})"
+                   for col in ["category"] + LANGUAGE_COLUMNS)}
+'''
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# READERS - each yields (english, category, translations) without loading the whole file
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _JsonStream:
+    """Incremental JSON tokenizer over a text file, decoding one value at a time"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(READ_CHUNK)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of file"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A value that ends exactly at the buffer edge might continue (e.g. a number)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def keys(self):
+        """Keys of the object starting here; the caller consumes each value before resuming"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def items(self):
+        """(key, value) pairs of the object starting here"""
+        for key in self.keys():
+            yield key, self.value()
+
+    def elements(self):
+        """Values of the array starting here"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+def _from_record(record, category=""):
+    """(english, category, translations) from a flat or nested record dict"""
+    record = {str(k).strip().lower(): v for k, v in record.items()}
+    translations = record.get("translations") or record
+    if isinstance(translations, dict):
+        translations = {str(k).strip().lower(): v for k, v in translations.items()}
+    return str(record.get("english") or "").strip(), record.get("category") or category, translations
+
+def read_json(path):
+    """{category: {english: {language: text}}} like common_words.json, or a list of records"""
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        if stream.peek() == "[":
+            for record in stream.elements():
+                yield _from_record(record)
+            return
+        for category in stream.keys():
+            for english, translations in stream.items():
+                if isinstance(translations, dict):
+                    translations = {str(k).strip().lower(): v for k, v in translations.items()}
+                yield str(english).strip(), category, translations
+
+def read_jsonl(path):
+    """One record per line: {"english": ..., "category": ..., "hindi": ...}"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield _from_record(json.loads(line))
+
+def read_csv(path):
+    """Header row with english, optional category, and one column per language"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield _from_record(row)
+
+READERS = {".json": read_json, ".jsonl": read_jsonl, ".ndjson": read_jsonl, ".csv": read_csv}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BULK LOAD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def upsert_rows(conn, rows, default_category="general"):
+    """Upsert a batch, re-derive its reverse-index forms and index the new words for suggestions
+
+    An empty category keeps an existing word's category; new words get default_category.
+    """
+    # Ids are AUTOINCREMENT, so rows above this are new words; merged ones keep their english
+    last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM words').fetchone()[0]
+    conn.executemany(UPSERT_SQL, rows)
+    conn.execute('UPDATE words SET category = ? WHERE id > ? AND category IS NULL', (default_category, last_id))
+    words = list(dict.fromkeys(row[0] for row in rows))
+    merged = []
+    for start in range(0, len(words), 500):
+        chunk = words[start:start + 500]
+        merged.extend(conn.execute(
+            f'SELECT id, english, {", ".join(LANGUAGE_COLUMNS)} FROM words WHERE english IN ({", ".join("?" * len(chunk))})',
+            chunk
+        ).fetchall())
+    conn.executemany('DELETE FROM word_forms WHERE word_id = ?', [(row[0],) for row in merged])
+    conn.executemany('INSERT OR IGNORE INTO word_forms (lang, form, word_id) VALUES (?, ?, ?)',
+                     [(lang, form, row[0]) for row in merged for lang, form in native_forms(row[2:])])
+    index_deletes(conn, [(row[0], row[1]) for row in merged if row[0] > last_id])
+
+def import_file(builder, path, batch_size=BATCH_SIZE, progress_every=PROGRESS_EVERY):
+    """Merge a JSON, JSONL or CSV wordlist into builder's database
+
+    Existing words keep any language the file leaves empty. Returns
+    {"rows", "skipped", "seconds", "rows_per_sec"}.
+    """
+    reader = READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f"Unsupported wordlist format: {path}")
+
+    conn = builder.conn
+    # Bulk-load settings: skipping fsync survives a process crash, only power loss mid-import risks the file
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-131072")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+    rows, batch = 0, []
+    skipped = 0
+    started = time.perf_counter()
+    next_report = progress_every
+    try:
+        for english, category, translations in reader(path):
+            english = english.lower()
+            if not english or not isinstance(translations, dict):
+                skipped += 1
+                continue
+            # Readers lowercase language keys; a word repeated within a batch merges via the upsert
+            batch.append([english, category] + [translations.get(col) or '' for col in LANGUAGE_COLUMNS])
+            if len(batch) >= batch_size:
+                with conn:
+                    upsert_rows(conn, batch)
+                rows += len(batch)
+                batch = []
+                if rows >= next_report:
+                    elapsed = time.perf_counter() - started
+                    print(f"📥 {rows:,} rows ({rows / elapsed:,.0f} rows/s)")
+                    next_report += progress_every
+        if batch:
+            with conn:
+                upsert_rows(conn, batch)
+            rows += len(batch)
+    finally:
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+    seconds = time.perf_counter() - started
+    rate = rows / seconds if seconds else 0.0
+    print(f"✅ Imported {rows:,} rows in {seconds:.1f}s ({rate:,.0f} rows/s), skipped {skipped}")
+    return {"rows": rows, "skipped": skipped, "seconds": round(seconds, 2), "rows_per_sec": round(rate)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import a wordlist into the dictionary")
+    parser.add_argument("path", help="wordlist (.json, .jsonl or .csv)")
+    parser.add_argument("--db", default="data/dictionary.db", help="dictionary database")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per transaction")
+    args = parser.parse_args()
+
+    db = DictionaryBuilder(args.db)
+    import_file(db, args.path, batch_size=args.batch_size)
+    db.close()
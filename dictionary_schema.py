@@ -0,0 +1,239 @@
+"""
+Dictionary Schema
+Optional normalized layout: one row per (word, language) instead of 22 wide columns
+
+Migrated in place, triggers on the words table keep entries / translations
+current for every writer (add_word, bulk imports, the Sheets replica).
+Migrated into a separate database it is a snapshot; re-run migrate to refresh it.
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+from dictionary_builder import LANGUAGE_COLUMNS
+
+BATCH_SIZE = 20000  # entries copied per transaction
+
+def create_normalized_schema(conn):
+    """Create languages / entries / translations and the words_wide view"""
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS languages (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            english TEXT NOT NULL UNIQUE,
+            category TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        -- Clustered on (word_id, lang_id): a word's translations sit together on one page
+        CREATE TABLE IF NOT EXISTS translations (
+            word_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+            lang_id INTEGER NOT NULL REFERENCES languages(id),
+            text TEXT NOT NULL,
+            source TEXT,
+            quality REAL,
+            PRIMARY KEY (word_id, lang_id)
+        ) WITHOUT ROWID;
+    ''')
+    conn.executemany('INSERT OR IGNORE INTO languages (id, name) VALUES (?, ?)',
+                     list(enumerate(LANGUAGE_COLUMNS, 1)))
+    create_wide_view(conn)
+    conn.commit()
+
+def create_wide_view(conn):
+    """(Re)create words_wide, the old one-column-per-language shape, from the languages table"""
+    languages = conn.execute('SELECT id, name FROM languages ORDER BY id').fetchall()
+    # One primary-key seek per column keeps single-word lookups through the view cheap
+    columns = ",\n".join(
+        f"COALESCE((SELECT text FROM translations t WHERE t.word_id = e.id AND t.lang_id = {lang_id}), '') AS {name}"
+        for lang_id, name in languages
+    )
+    conn.execute('DROP VIEW IF EXISTS words_wide')
+    conn.execute(f'''
+        CREATE VIEW words_wide AS
+        SELECT e.id, e.english, e.category,
+        {columns},
+        e.created_at
+        FROM entries e
+    ''')
+
+# Re-setting a translation to the same text keeps its provenance
+UPSERT_TRANSLATION = '''
+    ON CONFLICT(word_id, lang_id) DO UPDATE SET
+        text = excluded.text,
+        source = CASE WHEN translations.text = excluded.text THEN translations.source ELSE excluded.source END,
+        quality = CASE WHEN translations.text = excluded.text THEN translations.quality ELSE excluded.quality END
+'''
+
+def create_sync_triggers(conn):
+    """Mirror every insert, update and delete on words into entries / translations
+
+    Writers do not turn on foreign_keys, so the triggers delete translations
+    themselves instead of relying on ON DELETE CASCADE.
+    """
+    lang_ids = dict(conn.execute('SELECT name, id FROM languages').fetchall())
+    languages = [(lang, lang_ids[lang]) for lang in LANGUAGE_COLUMNS]
+    def sync(changed):
+        return "\n".join(
+            f"DELETE FROM translations WHERE word_id = new.id AND lang_id = {lang_id}"
+            f" AND COALESCE(new.{lang}, '') = ''{changed.format(lang=lang)};\n"
+            f"INSERT INTO translations (word_id, lang_id, text) SELECT new.id, {lang_id}, new.{lang}"
+            f" WHERE new.{lang} != ''{changed.format(lang=lang)} {UPSERT_TRANSLATION};"
+            for lang, lang_id in languages
+        )
+    inserts = sync("")
+    updates = sync(" AND new.{lang} IS NOT old.{lang}")
+    for name in ("words_sync_insert", "words_sync_update", "words_sync_delete"):
+        conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+    conn.execute(f'''
+        CREATE TRIGGER words_sync_insert AFTER INSERT ON words BEGIN
+            DELETE FROM translations WHERE word_id IN (SELECT id FROM entries WHERE english = new.english AND id != new.id);
+            DELETE FROM entries WHERE english = new.english AND id != new.id;
+            INSERT INTO entries (id, english, category, created_at) VALUES (new.id, new.english, new.category, new.created_at)
+            ON CONFLICT(id) DO UPDATE SET english = excluded.english, category = excluded.category;
+            {inserts}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER words_sync_update AFTER UPDATE ON words BEGIN
+            UPDATE entries SET english = new.english, category = new.category WHERE id = new.id;
+            {updates}
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER words_sync_delete AFTER DELETE ON words BEGIN
+            DELETE FROM translations WHERE word_id = old.id;
+            DELETE FROM entries WHERE id = old.id;
+        END
+    ''')
+    conn.commit()
+
+def add_language(conn, name):
+    """Register a language; no ALTER TABLE needed. Returns its lang_id"""
+    name = name.strip().lower()
+    conn.execute('INSERT OR IGNORE INTO languages (name) VALUES (?)', (name,))
+    create_wide_view(conn)
+    conn.commit()
+    return conn.execute('SELECT id FROM languages WHERE name = ?', (name,)).fetchone()[0]
+
+def set_translation(conn, english, language, text, source=None, quality=None):
+    """Upsert one translation with its provenance; False if the word or language is unknown
+
+    In an in-place layout the wide words column is updated too, so both shapes agree.
+    """
+    conn.execute("PRAGMA foreign_keys=ON")
+    if language.lower() in LANGUAGE_COLUMNS and conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words'"
+    ).fetchone():
+        conn.execute(f'UPDATE words SET {language.lower()} = ? WHERE english = ?', (text, english))
+    row = conn.execute('''
+        SELECT e.id, l.id FROM entries e, languages l WHERE e.english = ? AND l.name = ?
+    ''', (english, language.lower())).fetchone()
+    if row is None:
+        return False
+    conn.execute('''
+        INSERT INTO translations (word_id, lang_id, text, source, quality) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(word_id, lang_id) DO UPDATE SET
+            text = excluded.text, source = excluded.source, quality = excluded.quality
+    ''', (row[0], row[1], text, source, quality))
+    conn.commit()
+    return True
+
+def migrate(src_path, dst_path=None, source=None):
+    """Copy the wide words table into the normalized layout
+
+    dst_path=None migrates in place, next to the words table, and installs
+    the sync triggers. Entry ids keep the words.id values so word_forms
+    still points at the right rows. Empty strings are not stored. Re-running
+    refreshes the layout: entries whose word was replaced or deleted go,
+    translations whose text did not change keep their provenance.
+    Returns {"entries", "translations", "seconds"}.
+    """
+    started = time.perf_counter()
+    src = sqlite3.connect(src_path)
+    dst = src if dst_path in (None, src_path) else sqlite3.connect(dst_path)
+    # Deleting a stale entry cascades to its translations
+    dst.execute("PRAGMA foreign_keys=ON")
+    create_normalized_schema(dst)
+    lang_ids = dict(dst.execute('SELECT name, id FROM languages').fetchall())
+    column_ids = [lang_ids[lang] for lang in LANGUAGE_COLUMNS]
+    dst.execute('CREATE TEMP TABLE IF NOT EXISTS migrated (id INTEGER PRIMARY KEY)')
+    dst.execute('DELETE FROM migrated')
+
+    entries = translations = 0
+    cursor = src.execute(f'SELECT id, english, category, created_at, {", ".join(LANGUAGE_COLUMNS)} FROM words ORDER BY id')
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        pairs = [
+            (row[0], lang_ids[lang], text, source, None)
+            for row in rows
+            for lang, text in zip(LANGUAGE_COLUMNS, row[4:])
+            if text
+        ]
+        # Per word: its id plus the lang_ids it has text for, padded with 0 (no such language)
+        kept = [
+            [row[0]] + [lang_id if text else 0 for lang_id, text in zip(column_ids, row[4:])]
+            for row in rows
+        ]
+        with dst:
+            dst.executemany('DELETE FROM entries WHERE english = ? AND id != ?', [(row[1], row[0]) for row in rows])
+            dst.executemany('''
+                INSERT INTO entries (id, english, category, created_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET english = excluded.english, category = excluded.category
+            ''', [row[:4] for row in rows])
+            dst.executemany(f'''
+                DELETE FROM translations WHERE word_id = ? AND lang_id NOT IN ({", ".join("?" * len(column_ids))})
+            ''', kept)
+            dst.executemany('INSERT INTO translations (word_id, lang_id, text, source, quality) VALUES (?, ?, ?, ?, ?)'
+                            + UPSERT_TRANSLATION, pairs)
+            dst.executemany('INSERT INTO migrated (id) VALUES (?)', [(row[0],) for row in rows])
+        entries += len(rows)
+        translations += len(pairs)
+
+    with dst:
+        dst.execute('DELETE FROM entries WHERE id NOT IN (SELECT id FROM migrated)')
+        dst.execute('DROP TABLE migrated')
+    if dst is src:
+        create_sync_triggers(dst)
+    else:
+        dst.close()
+    src.close()
+    seconds = time.perf_counter() - started
+    print(f"✅ Migrated {entries:,} words ({translations:,} translations) in {seconds:.1f}s")
+    return {"entries": entries, "translations": translations, "seconds": round(seconds, 2)}
+
+def table_bytes(conn, name):
+    """On-disk size of a table and its indexes (needs the dbstat virtual table)"""
+    try:
+        return conn.execute('''
+            SELECT COALESCE(SUM(s.pgsize), 0) FROM dbstat s JOIN sqlite_master m ON m.name = s.name
+            WHERE m.tbl_name = ?
+        ''', (name,)).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the wide words table to the normalized layout")
+    parser.add_argument("--db", default="data/dictionary.db", help="database holding the words table")
+    parser.add_argument("--out", default=None, help="write the normalized tables to this database instead")
+    args = parser.parse_args()
+
+    migrate(args.db, args.out)
+
+    src = sqlite3.connect(args.db)
+    dst = sqlite3.connect(args.out or args.db)
+    wide = table_bytes(src, "words")
+    compact = table_bytes(dst, "translations")
+    if wide is not None and compact is not None:
+        compact += table_bytes(dst, "entries")
+        print(f"📦 words: {wide / 1024:,.0f} KB → entries + translations: {compact / 1024:,.0f} KB")
+    elif args.out and os.path.exists(args.out):
+        print(f"📦 {args.out}: {os.path.getsize(args.out) / 1024:,.0f} KB")
+    src.close()
+    dst.close()
@@ -0,0 +1,229 @@
+"""
+Dictionary Search
+Substring, prefix and "did you mean" search over the words table
+"""
+
+import sqlite3
+
+FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+        english, content='words', content_rowid='id', tokenize='trigram'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+        INSERT INTO words_fts(rowid, english) VALUES (new.id, new.english);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, english) VALUES ('delete', old.id, old.english);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE OF english ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, english) VALUES ('delete', old.id, old.english);
+        INSERT INTO words_fts(rowid, english) VALUES (new.id, new.english);
+    END
+    '''
+]
+
+SUGGEST_PREFIX = 7      # only this many leading characters are indexed, as in SymSpell
+SUGGEST_DISTANCE = 2    # deletions stored per word; the largest distance suggest() serves
+MAX_CANDIDATES = 500    # words checked with edit_distance per suggest() call
+
+MIN_SUBSTRING = 3       # shorter queries get prefix matches only; '%q%' would scan every word
+
+# "Did you mean" delete index: every string reachable from a word's prefix by up to
+# SUGGEST_DISTANCE deletions -> word. Maintained at write time like word_forms.
+# There is no word_id index (it would be as large as the table): writers remove a
+# replaced word's rows by recomputing its variants, and rows left behind by other
+# deletes only cost space, since suggest() joins candidates back to words.
+SUGGEST_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS word_deletes (
+        variant TEXT NOT NULL,
+        word_id INTEGER NOT NULL,
+        PRIMARY KEY (variant, word_id)
+    ) WITHOUT ROWID
+    ''',
+    # Earlier versions kept a word_id index for a delete trigger
+    'DROP TRIGGER IF EXISTS word_deletes_delete',
+    'DROP INDEX IF EXISTS idx_word_deletes_word'
+]
+
+def create_search_index(conn):
+    """Create the trigram FTS5 index and its sync triggers; False if FTS5 trigram is unavailable"""
+    try:
+        created = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'words_fts'").fetchone() is None
+        for statement in FTS_SCHEMA:
+            conn.execute(statement)
+        if created:
+            conn.execute("INSERT INTO words_fts(words_fts) VALUES ('rebuild')")
+        conn.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        # SQLite older than 3.34 has no trigram tokenizer - search falls back to LIKE
+        print(f"⚠️ Substring index unavailable: {e}")
+        conn.rollback()
+        return False
+
+def edit_distance(a, b, max_distance):
+    """Edit distance with adjacent transpositions (optimal string alignment)
+
+    Returns max_distance + 1 as soon as the distance is certain to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        # Later rows build on this row (+0/+1) or the one before it (+1)
+        if min(current) > max_distance and min(previous) >= max_distance:
+            return max_distance + 1
+        before, previous = previous, current
+    return previous[-1]
+
+def deletes(word, max_distance=SUGGEST_DISTANCE, prefix_length=SUGGEST_PREFIX):
+    """{variant: deletions} for word's prefix and every string reachable from it by up to max_distance deletions"""
+    level = {word[:prefix_length]}
+    variants = dict.fromkeys(level, 0)
+    for depth in range(1, max_distance + 1):
+        level = {w[:i] + w[i + 1:] for w in level if len(w) > 1 for i in range(len(w))}
+        for variant in level:
+            variants.setdefault(variant, depth)
+    return variants
+
+def index_deletes(conn, rows):
+    """Add (id, english) rows to the suggestion index; already indexed rows are left alone"""
+    conn.executemany('INSERT OR IGNORE INTO word_deletes (variant, word_id) VALUES (?, ?)',
+                     [(variant, word_id) for word_id, english in rows for variant in deletes(english.lower())])
+
+def unindex_deletes(conn, rows):
+    """Remove (id, english) rows from the suggestion index, one primary-key seek per variant"""
+    conn.executemany('DELETE FROM word_deletes WHERE variant = ? AND word_id = ?',
+                     [(variant, word_id) for word_id, english in rows for variant in deletes(english.lower())])
+
+def create_suggest_index(conn):
+    """Create the suggestion index, filling it from the words table if it is new"""
+    for statement in SUGGEST_SCHEMA:
+        conn.execute(statement)
+    if conn.execute('SELECT 1 FROM word_deletes LIMIT 1').fetchone() is None:
+        rows = conn.execute('SELECT id, english FROM words')
+        while True:
+            chunk = rows.fetchmany(10000)
+            if not chunk:
+                break
+            index_deletes(conn, chunk)
+    conn.commit()
+
+class DictionarySearch:
+    """Ranked search over a DictionaryBuilder's words table
+
+    - exact and prefix matches walk the UNIQUE index on english
+    - substring matches use the words_fts trigram index
+    - "did you mean" suggestions come from the word_deletes table
+      (symmetric delete spelling correction), so nothing is built per process
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        self.has_fts = builder.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'words_fts'"
+        ).fetchone() is not None
+
+    def _records(self, where, params, limit):
+        from dictionary_builder import WORD_COLUMNS  # deferred: dictionary_builder imports this module
+        rows = self.builder.conn.execute(
+            f'SELECT {", ".join("w." + c for c in WORD_COLUMNS)} FROM words w {where} LIMIT ?',
+            list(params) + [limit]
+        ).fetchall()
+        return [dict(zip(WORD_COLUMNS, row)) for row in rows]
+
+    def prefix(self, query, limit=10):
+        """Words starting with query, alphabetically (type-ahead)"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        # Range scan on the english index; U+10FFFF sorts after every other character
+        return self._records('WHERE w.english >= ? AND w.english < ? ORDER BY w.english',
+                             (query, query + "\U0010ffff"), limit)
+
+    def substring(self, query, limit=20):
+        """Words containing query, shortest first"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        if self.has_fts and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            return self._records(
+                'JOIN words_fts f ON f.rowid = w.id WHERE words_fts MATCH ? ORDER BY length(w.english), w.english',
+                (phrase,), limit)
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return self._records("WHERE w.english LIKE ? ESCAPE '\\' ORDER BY length(w.english), w.english",
+                             (f"%{escaped}%",), limit)
+
+    def suggest(self, query, max_distance=2, limit=5):
+        """Closest dictionary words to a possibly misspelled query"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        # Short words tolerate fewer edits before suggestions become noise
+        max_distance = min(max_distance, SUGGEST_DISTANCE, max(1, len(query) // 3))
+        # A word within max_distance shares a deletion variant with the query (at most 29 of them);
+        # candidates reached through fewer deletions are usually closer, so they are checked first
+        variants = deletes(query, max_distance)
+        rows = self.builder.conn.execute(f'''
+            WITH q(variant, depth) AS (VALUES {", ".join(["(?, ?)"] * len(variants))})
+            SELECT w.english FROM q JOIN word_deletes d ON d.variant = q.variant JOIN words w ON w.id = d.word_id
+            WHERE length(w.english) BETWEEN ? AND ?
+            GROUP BY w.id ORDER BY MIN(q.depth), abs(length(w.english) - ?) LIMIT ?
+        ''', [value for item in variants.items() for value in item]
+              + [len(query) - max_distance, len(query) + max_distance, len(query), MAX_CANDIDATES]).fetchall()
+        matches = []
+        for (english,) in rows:
+            distance = edit_distance(query, english, max_distance)
+            if 0 < distance <= max_distance:
+                matches.append((distance, english))
+        matches.sort(key=lambda m: (m[0], abs(len(m[1]) - len(query)), m[1]))
+        return [word for distance, word in matches][:limit]
+
+    def search(self, query, limit=20):
+        """Exact, then prefix, then substring, then fuzzy matches; each record gains a 'match' key
+
+        Stops as soon as limit records are found, so later (slower) stages only
+        run when the earlier ones come up short.
+        """
+        results = []
+        seen = set()
+
+        def add(records, match):
+            for record in records:
+                if len(results) >= limit:
+                    return
+                if record['english'] not in seen:
+                    seen.add(record['english'])
+                    results.append(dict(record, match=match))
+
+        query = query.strip().lower()
+        exact = self.builder.get_word(query)
+        add([exact] if exact else [], "exact")
+        if len(results) >= limit:
+            return results
+        add(self.prefix(query, limit), "prefix")
+        if len(results) >= limit:
+            return results
+        if len(query) >= MIN_SUBSTRING:
+            add(self.substring(query, limit), "substring")
+            if len(results) >= limit:
+                return results
+        for word in self.suggest(query, limit=limit - len(results)):
+            record = self.builder.get_word(word)
+            add([record] if record else [], "fuzzy")
+        return results
@@ -0,0 +1,182 @@
+"""
+Dictionary Store
+Local SQLite (DictionaryBuilder) as the primary store, Google Sheets as a replica
+"""
+
+import threading
+import time
+
+from dictionary_builder import DictionaryBuilder, LANGUAGE_COLUMNS
+from utils.singleflight import SingleFlight
+
+SYNC_INTERVAL = 30  # seconds between Sheets replica syncs
+
+class DictionaryStore:
+    """Read and write words against the local SQLite dictionary
+
+    Lookups and counts only touch SQLite, so they keep working when Google
+    Sheets is slow or over quota. Saved words are also queued in a
+    sheet_outbox table that SheetsReplica drains in the background.
+    """
+
+    def __init__(self, db_path="data/dictionary.db"):
+        self.builder = DictionaryBuilder(db_path)
+        self.builder.conn.execute('''
+            CREATE TABLE IF NOT EXISTS sheet_outbox (
+                english TEXT PRIMARY KEY,
+                queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self.builder.conn.commit()
+        self.write_lock = threading.Lock()
+        self.flights = SingleFlight()
+        # Bumped on every successful save; readers key caches on it
+        self.version = 0
+        self.replica = None
+
+    def lookup(self, english):
+        """Return the word's record ({english, category, hindi, ...}) or None"""
+        return self.builder.get_word(english.strip().lower())
+
+    def reverse_lookup(self, native_word, language=None, limit=20):
+        """Records whose translation matches a native-script word"""
+        return self.builder.reverse_lookup(native_word, language, limit)
+
+    def suggest(self, english, limit=5):
+        """Dictionary words close to a misspelled english word"""
+        return self.builder.suggest(english, limit=limit)
+
+    def search(self, query, limit=20):
+        """Ranked exact/prefix/substring/fuzzy matches"""
+        return self.builder.search_word(query, limit)
+
+    def count(self):
+        return self.builder.count_words()
+
+    def save(self, english, category, translations, replicate=True):
+        """Add a new word; False if it already exists
+
+        Sessions saving the same word at the same time share one write and
+        all get its result, instead of one of them seeing "already exists".
+        """
+        english = english.strip().lower()
+        return self.flights.do(("save", english), self._save, english, category, translations, replicate)
+
+    def _save(self, english, category, translations, replicate):
+        with self.write_lock:
+            if self.builder.get_word(english):
+                return False
+            if not self.builder.add_word(english, translations, category):
+                return False
+            if replicate:
+                conn = self.builder.conn
+                conn.execute('INSERT OR IGNORE INTO sheet_outbox (english) VALUES (?)', (english,))
+                conn.commit()
+            self.version += 1
+        if replicate and self.replica is not None:
+            self.replica.wake()
+        return True
+
+    def outbox(self, limit=100):
+        """Words saved locally but not yet pushed to the replica"""
+        rows = self.builder.conn.execute(
+            'SELECT english FROM sheet_outbox ORDER BY queued_at LIMIT ?', (limit,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_replicated(self, words):
+        conn = self.builder.conn
+        conn.executemany('DELETE FROM sheet_outbox WHERE english = ?', [(w,) for w in words])
+        conn.commit()
+
+    def start_replica(self, interval=SYNC_INTERVAL):
+        """Start syncing with Google Sheets in the background"""
+        if self.replica is None:
+            self.replica = SheetsReplica(self, interval)
+            self.replica.start()
+        return self.replica
+
+class SheetsReplica:
+    """Two-way background sync between the local store and Google Sheets
+
+    push: outbox words go to the sheet through SheetWriter, one append_rows
+    call per batch, and leave the outbox only once the write succeeded.
+    pull: rows other users appended to the sheet are inserted locally.
+    """
+
+    def __init__(self, store, interval=SYNC_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self.pulled = 0
+        self.event = threading.Event()
+        self.stats = {"pushed": 0, "pulled": 0, "errors": 0, "last_sync": None}
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sheets-replica", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Sync soon instead of waiting out the interval"""
+        self.event.set()
+
+    def _run(self):
+        while True:
+            self.sync()
+            self.event.wait(self.interval)
+            self.event.clear()
+
+    def sync(self):
+        try:
+            from google_sheets_db import get_repository, get_writer
+            repository = get_repository()
+            self.pull(repository)
+            self.push(repository, get_writer())
+            self.stats["last_sync"] = time.time()
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"⚠️ Sheets sync failed: {e}")
+
+    def push(self, repository, writer):
+        from google_sheets_db import FLUSH_BATCH_SIZE, build_row
+        while True:
+            words = self.store.outbox(FLUSH_BATCH_SIZE)
+            if not words:
+                return
+            rows = []
+            for english in words:
+                record = self.store.builder.get_word(english)
+                if record and not repository.get(english):
+                    rows.append(build_row(english, record.get('category') or 'general', record))
+            if rows:
+                if not writer.write(rows):
+                    # Still in the outbox; the next sync retries
+                    self.stats["errors"] += 1
+                    return
+                self.stats["pushed"] += len(rows)
+            self.store.mark_replicated(words)
+
+    def pull(self, repository):
+        repository.refresh(force=True)
+        records, self.pulled = repository.records_since(self.pulled)
+        for record in records:
+            english = str(record.get('english', '')).strip().lower()
+            if not english or self.store.lookup(english):
+                continue
+            translations = {col: record.get(col, '') for col in LANGUAGE_COLUMNS}
+            if self.store.save(english, record.get('category') or 'general', translations, replicate=False):
+                self.stats["pulled"] += 1
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store(replicate=True):
+    """Process-wide DictionaryStore, with the Sheets replica running"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DictionaryStore()
+            if replicate:
+                _store.start_replica()
+        return _store
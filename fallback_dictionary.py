@@ -0,0 +1,126 @@
+"""Local fallback tier: answer translations from the bundled dataset before calling Sarvam"""
+import json
+import os
+import re
+import threading
+
+from translation_cache import normalize_text
+
+PLACEHOLDERS = {"", "translation unavailable"}
+
+# Words the translator always knew offline; data/common_words.json adds to these
+BUILTIN_WORDS = {"hello": {"hindi": "नमस्ते"}, "potato": {"hindi": "आलू"}}
+
+# Regular plurals only, as (suffix, replacement); each stem must itself be a dictionary word
+PLURAL_RULES = [("ies", "y"), ("ches", "ch"), ("shes", "sh"), ("xes", "x"), ("sses", "ss"), ("s", "")]
+
+def is_translation(text, english):
+    """False for empty cells, placeholders and the untranslated word (what the app saves for failed languages)"""
+    return bool(text) and text.strip().lower() not in PLACEHOLDERS | {english.strip().lower()}
+
+def exact_form(text):
+    """Normalized text with a trailing possessive removed (cat's, cats' -> cat, cats)"""
+    return re.sub(r"'s?$", "", normalize_text(text))
+
+def plural_stems(text):
+    """Singular candidates for a regular plural last word, closest first"""
+    text = exact_form(text)
+    head, _, last = text.rpartition(" ")
+    prefix = head + " " if head else ""
+    forms = []
+    for suffix, replacement in PLURAL_RULES:
+        if not last.endswith(suffix) or last.endswith(("ss", "us", "is")):
+            continue
+        stem = last[:len(last) - len(suffix)] + replacement
+        if len(stem) >= 3:
+            forms.append(prefix + stem)
+    return list(dict.fromkeys(forms))
+
+class FallbackDictionary:
+    """Translations from data/common_words.json and the local dictionary, loaded once
+
+    common_words.json is indexed in memory at first use. Dictionary words are
+    read from the compiled artifact (dictionary_artifact.py) when one exists,
+    otherwise from the SQLite words table through its unique english index.
+    Hits are counted per tier.
+    """
+
+    def __init__(self, json_path="data/common_words.json", db_path="data/dictionary.db",
+                 artifact_path="data/dictionary.artifact"):
+        self.json_path = json_path
+        self.db_path = db_path
+        self.artifact_path = artifact_path
+        self.common = None
+        self.dictionary = None
+        self.lock = threading.Lock()
+        self.stats = {"common_words": 0, "dictionary": 0, "plurals": 0, "misses": 0}
+
+    def _load(self):
+        with self.lock:
+            if self.common is not None:
+                return
+            common = {english: dict(translations) for english, translations in BUILTIN_WORDS.items()}
+            try:
+                with open(self.json_path, "r", encoding="utf-8") as f:
+                    for words in json.load(f).values():
+                        for english, translations in words.items():
+                            common.setdefault(normalize_text(english), {}).update(
+                                (lang.lower(), text) for lang, text in translations.items()
+                                if text and text.strip().lower() not in PLACEHOLDERS
+                            )
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Fallback dictionary: {self.json_path} unavailable: {e}")
+            try:
+                if os.path.exists(self.artifact_path):
+                    from dictionary_artifact import DictionaryArtifact
+                    self.dictionary = DictionaryArtifact(self.artifact_path)
+                elif os.path.exists(self.db_path):
+                    from dictionary_builder import DictionaryBuilder
+                    self.dictionary = DictionaryBuilder(self.db_path)
+            except Exception as e:
+                print(f"⚠️ Fallback dictionary: {self.db_path} unavailable: {e}")
+            self.common = common
+
+    def lookup(self, text, language):
+        """Translation of exactly this word (case, spacing and possessive aside), or None"""
+        tier, translation = self._find(exact_form(text), language)
+        if translation:
+            return self._hit(tier, translation)
+        with self.lock:
+            self.stats["misses"] += 1
+        return None
+
+    def lookup_plural(self, text, language):
+        """Translation of the singular of a regular plural (cats -> cat), or None
+
+        Only an approximation of the word asked for, so the translator uses
+        it after Sarvam has failed and never caches or saves it.
+        """
+        for form in plural_stems(text):
+            _, translation = self._find(form, language)
+            if translation:
+                return self._hit("plurals", translation)
+        return None
+
+    def _find(self, form, language):
+        if self.common is None:
+            self._load()
+        lang = language.lower()
+        translation = self.common.get(form, {}).get(lang)
+        if translation:
+            return "common_words", translation
+        if self.dictionary is not None:
+            record = self.dictionary.get_word(form)
+            translation = (record or {}).get(lang)
+            if is_translation(translation, form):
+                return "dictionary", translation
+        return None, None
+
+    def _hit(self, tier, translation):
+        with self.lock:
+            self.stats[tier] += 1
+        return translation
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
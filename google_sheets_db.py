@@ -1,92 +1,292 @@
 """Google Sheets Database Handler"""
 import gspread
+from gspread.utils import rowcol_to_a1
 from oauth2client.service_account import ServiceAccountCredentials
+import requests
+from requests.adapters import HTTPAdapter
+import random
 import streamlit as st
+import threading
 import time
 
+from utils.language_utils import get_all_languages
+
+SPREADSHEET_NAME = "Multilingual_Dictionary"
+
+SCOPE = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive'
+]
+
+SERVICE_ACCOUNT_KEYS = [
+    "type", "project_id", "private_key_id", "private_key", "client_email", "client_id",
+    "auth_uri", "token_uri", "auth_provider_x509_cert_url", "client_x509_cert_url"
+]
+
+POOL_SIZE = 16  # keep-alive connections shared by all sessions
+
+def load_credentials():
+    """Service account credentials from st.secrets"""
+    credentials_dict = {key: st.secrets["gcp_service_account"][key] for key in SERVICE_ACCOUNT_KEYS}
+    return ServiceAccountCredentials.from_json_keyfile_dict(credentials_dict, SCOPE)
+
+def authorize_client(credentials):
+    """gspread client whose HTTP session keeps a pool of keep-alive connections"""
+    client = gspread.authorize(credentials)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    client.session.mount("https://", adapter)
+    return client
+
+def _is_reconnectable(error):
+    """Expired auth or a dropped connection - worth one fresh client"""
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 401
+
+class SheetClientManager:
+    """Authorize once per process and cache the opened worksheet
+    
+    The gspread client's AuthorizedSession refreshes the access token on its
+    own; when a call still fails with 401 or a dropped connection, the client
+    is rebuilt and the call retried once. Pass a fake client_factory (any
+    callable returning an object with .open(name).sheet1) to run without
+    Google.
+    """
+    
+    def __init__(self, credentials_loader=load_credentials, client_factory=authorize_client,
+                 spreadsheet_name=SPREADSHEET_NAME):
+        self.credentials_loader = credentials_loader
+        self.client_factory = client_factory
+        self.spreadsheet_name = spreadsheet_name
+        self.client = None
+        self.sheet = None
+        self.connects = 0
+        self.lock = threading.Lock()
+    
+    def worksheet(self):
+        """Cached worksheet handle, connecting on first use"""
+        with self.lock:
+            if self.sheet is None:
+                self.client = self.client_factory(self.credentials_loader())
+                self.sheet = self.client.open(self.spreadsheet_name).sheet1
+                self.connects += 1
+            return self.sheet
+    
+    def reset(self):
+        """Drop the cached client so the next call reconnects"""
+        with self.lock:
+            self.client = None
+            self.sheet = None
+    
+    def run(self, operation):
+        """Call operation(sheet), reconnecting once on auth or connection failure"""
+        try:
+            return operation(self.worksheet())
+        except Exception as e:
+            if not _is_reconnectable(e):
+                raise
+            self.reset()
+            return operation(self.worksheet())
+
+_client_manager = None
+_client_manager_lock = threading.Lock()
+
+def get_client_manager():
+    """Process-wide SheetClientManager shared by every Streamlit session"""
+    global _client_manager
+    with _client_manager_lock:
+        if _client_manager is None:
+            _client_manager = SheetClientManager()
+        return _client_manager
+
 def connect_to_sheet():
     """Connect to Google Sheet"""
     try:
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        credentials_dict = {
-            "type": st.secrets["gcp_service_account"]["type"],
-            "project_id": st.secrets["gcp_service_account"]["project_id"],
-            "private_key_id": st.secrets["gcp_service_account"]["private_key_id"],
-            "private_key": st.secrets["gcp_service_account"]["private_key"],
-            "client_email": st.secrets["gcp_service_account"]["client_email"],
-            "client_id": st.secrets["gcp_service_account"]["client_id"],
-            "auth_uri": st.secrets["gcp_service_account"]["auth_uri"],
-            "token_uri": st.secrets["gcp_service_account"]["token_uri"],
-            "auth_provider_x509_cert_url": st.secrets["gcp_service_account"]["auth_provider_x509_cert_url"],
-            "client_x509_cert_url": st.secrets["gcp_service_account"]["client_x509_cert_url"]
-        }
-        
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials_dict, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open("Multilingual_Dictionary").sheet1
-        return sheet
+        return get_client_manager().worksheet()
     except Exception as e:
         st.error(f"❌ Google Sheets error: {e}")
         return None
 
+REFRESH_INTERVAL = 60  # seconds between incremental snapshot refreshes
+
+FLUSH_BATCH_SIZE = 100   # rows per append_rows call
+MIN_FLUSH_GAP = 1.0      # keeps us under the 60 writes/minute Sheets quota
+MAX_WRITE_RETRIES = 6
+
+SHEET_COLUMNS = ["english", "category"] + [lang.lower() for lang in get_all_languages()]
+
+def build_row(english, category, translations):
+    """Sheet row for a word, in SHEET_COLUMNS order"""
+    return [english, category] + [translations.get(col, '') for col in SHEET_COLUMNS[2:]]
+
+class SheetRepository:
+    """In-memory snapshot of the dictionary sheet, indexed by lowercased english
+    
+    The sheet is downloaded once; later refreshes compare the row count of the
+    english column and only fetch rows appended since the last look. Lookups
+    and counts between refreshes never touch the network.
+    """
+    
+    def __init__(self, client_manager=None, refresh_interval=REFRESH_INTERVAL):
+        self.client_manager = client_manager or get_client_manager()
+        self.refresh_interval = refresh_interval
+        self.header = list(SHEET_COLUMNS)
+        self.records = {}
+        self.row_count = 0
+        self.loaded = False
+        self.last_refresh = 0.0
+        self.lock = threading.RLock()
+    
+    def _record(self, values):
+        values = list(values) + [''] * (len(self.header) - len(values))
+        return dict(zip(self.header, values))
+    
+    def _index(self, rows):
+        for values in rows:
+            record = self._record(values)
+            key = str(record.get('english', '')).strip().lower()
+            if key and key not in self.records:
+                self.records[key] = record
+        self.row_count += len(rows)
+    
+    def load(self):
+        """Download the whole sheet and rebuild the index"""
+        with self.lock:
+            values = self.client_manager.run(lambda sheet: sheet.get_all_values())
+            if values:
+                self.header = [str(h).strip().lower() for h in values[0]]
+            self.records = {}
+            self.row_count = 0
+            self._index(values[1:])
+            self.loaded = True
+            self.last_refresh = time.time()
+            return True
+    
+    def refresh(self, force=False):
+        """Pull rows appended since the last refresh, at most once per interval"""
+        with self.lock:
+            if not self.loaded:
+                return self.load()
+            if not force and time.time() - self.last_refresh < self.refresh_interval:
+                return True
+            remote_rows = len(self.client_manager.run(lambda sheet: sheet.col_values(1))) - 1
+            if remote_rows < self.row_count:
+                # Rows were deleted or reordered upstream - start over
+                return self.load()
+            if remote_rows > self.row_count:
+                first = self.row_count + 2  # 1-based, skipping the header row
+                last = remote_rows + 1
+                last_cell = rowcol_to_a1(last, len(self.header))
+                self._index(self.client_manager.run(lambda sheet: sheet.get_values(f"A{first}:{last_cell}")))
+            self.last_refresh = time.time()
+            return True
+    
+    def get(self, english):
+        """Return the record for english, or None"""
+        with self.lock:
+            self.refresh()
+            return self.records.get(english.strip().lower())
+    
+    def count(self):
+        """Number of data rows in the sheet"""
+        with self.lock:
+            self.refresh()
+            return self.row_count
+    
+    def records_since(self, position):
+        """Records indexed after the first `position`, and the new position"""
+        with self.lock:
+            records = list(self.records.values())
+            if position > len(records):
+                position = 0  # snapshot shrank after a reload - rescan it
+            return records[position:], len(records)
+    
+    def append_rows(self, rows):
+        """Write rows with one append_rows call and move them into the snapshot"""
+        with self.lock:
+            self.client_manager.run(lambda sheet: sheet.append_rows(rows, value_input_option="RAW"))
+            self._index(rows)
+            return True
+
+def _is_retryable(error):
+    """Quota exhaustion and transient server errors"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status == 429 or (status is not None and status >= 500) or isinstance(error, requests.exceptions.RequestException)
+
+class SheetWriter:
+    """The one path that writes to the sheet
+    
+    write() sends rows with one append_rows call, never sooner than
+    MIN_FLUSH_GAP after the previous write, and retries quota and server
+    errors with exponential backoff. The store's sheet_outbox holds rows
+    until a write succeeds, so nothing is queued here.
+    """
+    
+    def __init__(self, repository, max_retries=MAX_WRITE_RETRIES):
+        self.repository = repository
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.last_flush = 0.0
+        self.stats = {"written": 0, "flushes": 0, "retries": 0, "failures": 0}
+    
+    def write(self, rows):
+        """Append rows to the sheet; False if they could not be written"""
+        with self.lock:
+            for attempt in range(self.max_retries + 1):
+                wait = MIN_FLUSH_GAP - (time.time() - self.last_flush)
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    self.last_flush = time.time()
+                    self.repository.append_rows(rows)
+                    self.stats["written"] += len(rows)
+                    self.stats["flushes"] += 1
+                    return True
+                except Exception as e:
+                    if attempt == self.max_retries or not _is_retryable(e):
+                        self.stats["failures"] += 1
+                        print(f"⚠️ Sheet write failed for {len(rows)} row(s): {e}")
+                        return False
+                    self.stats["retries"] += 1
+                    time.sleep(min(64, 2 ** attempt) + random.uniform(0, 1))
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+_repository = None
+_writer = None
+_repository_lock = threading.Lock()
+
+def get_repository():
+    """Process-wide SheetRepository shared by every Streamlit session"""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = SheetRepository()
+        return _repository
+
+def get_writer():
+    """Process-wide SheetWriter for the shared repository"""
+    global _writer
+    repository = get_repository()
+    with _repository_lock:
+        if _writer is None:
+            _writer = SheetWriter(repository)
+        return _writer
+
 def search_word(english_word):
     """Search for word"""
     try:
-        sheet = connect_to_sheet()
-        if not sheet:
-            return None
-        all_records = sheet.get_all_records()
-        for record in all_records:
-            if record.get('english', '').lower() == english_word.lower():
-                return record
-        return None
+        return get_repository().get(english_word)
     except:
         return None
 
-def save_word(english, category, translations):
-    """Save word to sheet"""
-    try:
-        sheet = connect_to_sheet()
-        if not sheet:
-            return False
-        
-        existing = search_word(english)
-        if existing:
-            st.warning(f"'{english}' already exists!")
-            return False
-        
-        row = [
-            english, category,
-            translations.get('hindi', ''), translations.get('bengali', ''),
-            translations.get('tamil', ''), translations.get('telugu', ''),
-            translations.get('malayalam', ''), translations.get('kannada', ''),
-            translations.get('marathi', ''), translations.get('gujarati', ''),
-            translations.get('odia', ''), translations.get('punjabi', ''),
-            translations.get('assamese', ''), translations.get('urdu', ''),
-            translations.get('maithili', ''), translations.get('sanskrit', ''),
-            translations.get('konkani', ''), translations.get('nepali', ''),
-            translations.get('sindhi', ''), translations.get('dogri', ''),
-            translations.get('manipuri', ''), translations.get('bodo', ''),
-            translations.get('kashmiri', ''), translations.get('santali', '')
-        ]
-        
-        sheet.append_row(row)
-        time.sleep(0.5)
-        return True
-    except Exception as e:
-        st.error(f"Save error: {e}")
-        return False
-
 def get_total_words():
     """Get word count"""
     try:
-        sheet = connect_to_sheet()
-        if not sheet:
-            return 0
-        return len(sheet.get_all_records())
+        return get_repository().count()
     except:
         return 0
@@ -2,39 +2,609 @@
 Sarvam-Translate API - CPU MODE (100% Reliable)
 """
 
-from flask import Flask, request, jsonify
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
+from collections import Counter
+from concurrent.futures import Future
+import copy
+import json
+import os
+import queue
+import threading
+import time
+import traceback
 
-app = Flask(__name__)
+from flask import Flask, Response, request, jsonify, stream_with_context
+
+PROCESS_STARTED = time.time()
+
+# torch and transformers take seconds to import, so import_runtime() pulls
+# them in on the loader thread after the port is already bound
+torch = None
+AutoModelForCausalLM = AutoTokenizer = StoppingCriteriaList = TextIteratorStreamer = DynamicCache = None
 
-print("="*80)
-print("Loading Sarvam-Translate (CPU mode)...")
-print("="*80)
+tokenizer = None
+model = None
+MODEL_FOOTPRINT_MB = 0.0
+
+app = Flask(__name__)
 
 model_name = "sarvamai/sarvam-translate"
 
-tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+# fp32 as before, bf16 halves weight memory, int8 quantizes every nn.Linear
+# dynamically, onnx exports to ONNX Runtime (needs optimum[onnxruntime])
+BACKENDS = ("fp32", "bf16", "int8", "onnx")
+BACKEND = os.environ.get("SARVAM_BACKEND", "fp32").lower()
+
+# SARVAM_WORKERS > 1 preforks that many gunicorn workers after the model loads;
+# they share the weight pages copy-on-write and split the cores between them
+WORKERS = int(os.environ.get("SARVAM_WORKERS", "1"))
+THREADS_PER_WORKER = max(1, (os.cpu_count() or 1) // max(1, WORKERS))
+
+def import_runtime():
+    """Import torch and the transformers classes the server uses"""
+    global torch, AutoModelForCausalLM, AutoTokenizer, StoppingCriteriaList, TextIteratorStreamer, DynamicCache
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, StoppingCriteriaList, TextIteratorStreamer
+    try:
+        from transformers import DynamicCache
+    except ImportError:  # transformers too old for explicit cache objects
+        DynamicCache = None
+
+def load_model(backend=BACKEND):
+    """Load Sarvam-Translate for CPU inference with the given backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM
+        except ImportError:
+            raise RuntimeError("onnx backend needs: pip install optimum[onnxruntime]")
+        return ORTModelForCausalLM.from_pretrained(model_name, export=True, trust_remote_code=True)
+    
+    loaded = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        trust_remote_code=True,
+        torch_dtype=torch.bfloat16 if backend == "bf16" else torch.float32,
+        low_cpu_mem_usage=True
+    )
+    loaded.to("cpu")
+    loaded.eval()
+    
+    if backend == "int8":
+        loaded = torch.ao.quantization.quantize_dynamic(loaded, {torch.nn.Linear}, dtype=torch.qint8)
+    return loaded
+
+def model_footprint(m):
+    """Bytes held by the model's weights (packed int8 weights included)"""
+    if not isinstance(m, torch.nn.Module):
+        # ONNX Runtime session - weights live in the exported files
+        save_dir = getattr(m, "model_save_dir", None)
+        if not save_dir:
+            return 0
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(save_dir) for name in names
+        )
+    
+    seen = set()
+    total = 0
+    
+    def add(value):
+        nonlocal total
+        if isinstance(value, (tuple, list)):
+            for item in value:
+                add(item)
+        elif isinstance(value, torch.Tensor):
+            key = (value.data_ptr(), value.numel())
+            if key not in seen:
+                seen.add(key)
+                total += value.numel() * value.element_size()
+    
+    for value in m.state_dict().values():
+        add(value)
+    return total
+
+def process_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
 
 # FORCE CPU - No CUDA issues
 device = "cpu"
-print(f"Device: CPU (avoiding CUDA issues)")
 
-model = AutoModelForCausalLM.from_pretrained(
-    model_name,
-    trust_remote_code=True,
-    torch_dtype=torch.float32,  # CPU needs float32
-    low_cpu_mem_usage=True
-)
+MAX_BATCH_SIZE = int(os.environ.get("SARVAM_MAX_BATCH_SIZE", "32"))
+BATCH_WAIT_MS = float(os.environ.get("SARVAM_BATCH_WAIT_MS", "15"))
+REQUEST_TIMEOUT = 300
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GENERATION POLICY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MAX_NEW_TOKENS = 256
+MIN_NEW_TOKENS = 16
+
+# Rough output tokens per English input token. Scripts the tokenizer covers
+# poorly (Ol Chiki, Dravidian conjuncts) need more room than Devanagari.
+LANGUAGE_SCRIPTS = {
+    "Hindi": "Devanagari", "Marathi": "Devanagari", "Maithili": "Devanagari",
+    "Sanskrit": "Devanagari", "Konkani": "Devanagari", "Nepali": "Devanagari",
+    "Dogri": "Devanagari", "Bodo": "Devanagari",
+    "Bengali": "Bengali", "Assamese": "Bengali", "Manipuri": "Bengali",
+    "Urdu": "Arabic", "Sindhi": "Arabic", "Kashmiri": "Arabic",
+    "Tamil": "Tamil", "Telugu": "Telugu", "Kannada": "Kannada", "Malayalam": "Malayalam",
+    "Gujarati": "Gujarati", "Odia": "Odia", "Punjabi": "Gurmukhi", "Santali": "Ol Chiki"
+}
+
+SCRIPT_TOKEN_RATIO = {
+    "Devanagari": 2.0, "Bengali": 2.5, "Arabic": 2.0, "Gujarati": 2.5, "Gurmukhi": 2.5,
+    "Tamil": 3.0, "Telugu": 3.0, "Kannada": 3.0, "Odia": 3.0, "Malayalam": 3.5, "Ol Chiki": 6.0
+}
+
+def token_budget(input_tokens, target_lang):
+    """max_new_tokens for input_tokens of source text going into target_lang"""
+    ratio = SCRIPT_TOKEN_RATIO.get(LANGUAGE_SCRIPTS.get(target_lang), 3.0)
+    return min(MAX_NEW_TOKENS, max(MIN_NEW_TOKENS, int(input_tokens * ratio) + 8))
+
+def _end_of_answer_ids():
+    """eos plus the chat template's end-of-turn marker, when the tokenizer has one"""
+    ids = [tokenizer.eos_token_id]
+    end_of_turn = tokenizer.convert_tokens_to_ids("<end_of_turn>")
+    if end_of_turn is not None and end_of_turn != tokenizer.unk_token_id and end_of_turn not in ids:
+        ids.append(end_of_turn)
+    return ids
+
+END_OF_ANSWER_IDS = None  # set once the tokenizer is loaded
+
+class StopOnNewline:
+    """Finish a row once its answer contains a line break
+    
+    Dictionary answers are a single line; anything after the first newline
+    is the model rambling. Rows whose source text is itself multi-line are
+    left alone. Follows the transformers StoppingCriteria call protocol.
+    """
+    
+    def __init__(self, prompt_len, allow_newline):
+        self.prompt_len = prompt_len
+        self.allow_newline = allow_newline
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        done = []
+        for row, allowed in zip(input_ids, self.allow_newline):
+            answer = tokenizer.decode(row[self.prompt_len:], skip_special_tokens=True).lstrip()
+            done.append(not allowed and "\n" in answer)
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+GENERATION_STATS = {"requests": 0, "tokens_generated": 0}
+generation_stats_lock = threading.Lock()
+
+def _record_tokens(counts):
+    with generation_stats_lock:
+        GENERATION_STATS["requests"] += len(counts)
+        GENERATION_STATS["tokens_generated"] += sum(counts)
+
+def generation_kwargs(pairs, prompt_len):
+    """Greedy decoding with a length-aware budget and single-line stop for pairs"""
+    source_lens = [len(tokenizer(text, add_special_tokens=False)['input_ids']) for text, _ in pairs]
+    return {
+        "max_new_tokens": max(token_budget(n, lang) for n, (_, lang) in zip(source_lens, pairs)),
+        "do_sample": False,
+        "num_return_sequences": 1,
+        "eos_token_id": END_OF_ANSWER_IDS,
+        "pad_token_id": tokenizer.pad_token_id,
+        "stopping_criteria": StoppingCriteriaList([
+            StopOnNewline(prompt_len, ["\n" in text for text, _ in pairs])
+        ])
+    }
+
+def build_prompt(text, target_lang):
+    """Wrap text in the Sarvam chat template for one target language"""
+    messages = [
+        {"role": "system", "content": f"Translate the text below to {target_lang}."},
+        {"role": "user", "content": text}
+    ]
+    return tokenizer.apply_chat_template(
+        messages,
+        tokenize=False,
+        add_generation_prompt=True
+    )
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROMPT-PREFIX KV CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PREFIX_CACHE_ENABLED = os.environ.get("SARVAM_PREFIX_CACHE", "1") != "0"
+PROMPT_SPLIT = "\u241eSARVAM_TEXT\u241e"
+
+class PrefixCache:
+    """Past key/values for the chat-template prefix of each target language
+    
+    Everything in the prompt before the user's text depends only on the
+    target language, so its prefill runs once per language. Generations
+    resume from a copy of that state and only prefill the text and the
+    closing template tokens; batches stitch one copy per row together.
+    """
+    
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        # hits / misses count rows; bypassed rows were prefilled in full although the cache was on
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "prefill_saved_ms": 0.0}
+    
+    def enabled(self):
+        return PREFIX_CACHE_ENABLED and DynamicCache is not None and isinstance(model, torch.nn.Module)
+    
+    def _build(self, target_lang):
+        prompt = build_prompt(PROMPT_SPLIT, target_lang)
+        prefix = prompt[:prompt.index(PROMPT_SPLIT)]
+        ids = tokenizer([prefix], return_tensors="pt")['input_ids']
+        started = time.perf_counter()
+        with torch.no_grad():
+            cache = model(input_ids=ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+        return {"ids": ids[0].tolist(), "cache": cache, "prefill_ms": (time.perf_counter() - started) * 1000}
+    
+    def get(self, target_lang):
+        with self.lock:
+            if target_lang not in self.entries:
+                self.entries[target_lang] = self._build(target_lang)
+            return self.entries[target_lang]
+    
+    def warm(self, languages):
+        """Precompute the prefix state for every language up front"""
+        if not self.enabled():
+            return
+        started = time.time()
+        for lang in languages:
+            self.get(lang)
+        print(f"✅ Prefix cache ready for {len(languages)} languages in {time.time() - started:.1f}s")
+    
+    def inputs_for(self, text, target_lang):
+        """generate() inputs that resume from the cached prefix, plus the prefill ms saved
+        
+        Returns (None, 0) when the cache cannot be used for this prompt.
+        """
+        if not self.enabled():
+            return None, 0.0
+        entry = self.get(target_lang)
+        ids = tokenizer([build_prompt(text, target_lang)], return_tensors="pt")['input_ids']
+        n = len(entry["ids"])
+        # The prefix must tokenize identically on its own and inside the full prompt
+        if ids.shape[1] <= n or ids[0, :n].tolist() != entry["ids"]:
+            with self.lock:
+                self.stats["misses"] += 1
+            return None, 0.0
+        with self.lock:
+            self.stats["hits"] += 1
+            self.stats["prefill_saved_ms"] += entry["prefill_ms"]
+        return {
+            "input_ids": ids,
+            "attention_mask": torch.ones_like(ids),
+            "past_key_values": copy.deepcopy(entry["cache"])
+        }, entry["prefill_ms"]
+    
+    def batch_inputs_for(self, pairs):
+        """generate() inputs for several rows, each resuming from its language's prefix
+        
+        Prefixes differ in length between languages and texts between rows,
+        so every row is laid out as [pad][prefix][pad][text + closing tokens]:
+        the cached keys/values are left-padded to the longest prefix and the
+        attention mask zeroes both pads. generate() derives position ids from
+        the mask, so each token keeps the position it has in its own prompt.
+        Returns (None, None) when any row cannot use the cache, else the
+        inputs and the prefill ms saved per row.
+        """
+        if not self.enabled():
+            return None, None
+        rows = []
+        for text, target_lang in pairs:
+            entry = self.get(target_lang)
+            ids = tokenizer([build_prompt(text, target_lang)], return_tensors="pt")['input_ids'][0].tolist()
+            n = len(entry["ids"])
+            if len(ids) <= n or ids[:n] != entry["ids"]:
+                with self.lock:
+                    self.stats["misses"] += 1
+                    self.stats["bypassed"] += len(pairs) - 1
+                return None, None
+            rows.append((entry, ids[n:]))
+        
+        prefix_len = max(len(entry["ids"]) for entry, _ in rows)
+        suffix_len = max(len(suffix) for _, suffix in rows)
+        input_ids, attention_mask, layers = [], [], []
+        for entry, suffix in rows:
+            lead, gap = prefix_len - len(entry["ids"]), suffix_len - len(suffix)
+            input_ids.append([tokenizer.pad_token_id] * lead + entry["ids"] + [tokenizer.pad_token_id] * gap + suffix)
+            attention_mask.append([0] * lead + [1] * len(entry["ids"]) + [0] * gap + [1] * len(suffix))
+            # (key, value) per layer, shaped [1, heads, prefix, head_dim]; pad the prefix axis on the left
+            layers.append([tuple(torch.nn.functional.pad(t, (0, 0, lead, 0)) for t in kv)
+                           for kv in entry["cache"].to_legacy_cache()])
+        cache = DynamicCache.from_legacy_cache(tuple(
+            (torch.cat([row[i][0] for row in layers]), torch.cat([row[i][1] for row in layers]))
+            for i in range(len(layers[0]))
+        ))
+        saved = [entry["prefill_ms"] for entry, _ in rows]
+        with self.lock:
+            self.stats["hits"] += len(rows)
+            self.stats["prefill_saved_ms"] += sum(saved)
+        return {
+            "input_ids": torch.tensor(input_ids),
+            "attention_mask": torch.tensor(attention_mask),
+            "past_key_values": cache
+        }, saved
+    
+    def bypass(self, rows):
+        """Count rows prefilled in full while the cache was on"""
+        if self.enabled():
+            with self.lock:
+                self.stats["bypassed"] += rows
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, languages=len(self.entries), enabled=self.enabled(),
+                        prefill_saved_ms=round(self.stats["prefill_saved_ms"], 1))
+
+prefix_cache = PrefixCache()
+
+def _count_generated(row):
+    """Tokens a row actually generated, ignoring padding after it finished"""
+    return int((row != tokenizer.pad_token_id).sum())
+
+def _first_line(text, source_text):
+    text = text.strip()
+    return text if "\n" in source_text else text.split("\n")[0].strip()
+
+def generate_batch(pairs, use_model=None):
+    """Translate a list of (text, target_lang) pairs with a single generate call
+    
+    Returns one {"translation", "tokens_generated"} dict per pair. use_model
+    overrides the serving model (the accuracy check compares against fp32).
+    """
+    if use_model is None:
+        use_model = model
+    inputs, saved = None, None
+    if use_model is not model:
+        prefix_cache.bypass(len(pairs))
+    elif len(pairs) == 1:
+        inputs, saved_ms = prefix_cache.inputs_for(*pairs[0])
+        saved = [saved_ms]
+    else:
+        inputs, saved = prefix_cache.batch_inputs_for(pairs)
+    if inputs is None:
+        prompts = [build_prompt(text, target_lang) for text, target_lang in pairs]
+        inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+        saved = [0.0] * len(pairs)
+    # Left padding means every row's prompt ends at the same column
+    prompt_len = inputs['input_ids'].shape[1]
+    
+    with torch.no_grad():
+        outputs = use_model.generate(**inputs, **generation_kwargs(pairs, prompt_len))
+    
+    results = []
+    for (text, _), row, saved_ms in zip(pairs, outputs, saved):
+        generated = row[prompt_len:]
+        results.append({
+            "translation": _first_line(tokenizer.decode(generated, skip_special_tokens=True), text),
+            "tokens_generated": _count_generated(generated),
+            "prefill_saved_ms": round(saved_ms, 1)
+        })
+    _record_tokens([r["tokens_generated"] for r in results])
+    return results
+
+def _bucket(n):
+    """Power-of-two histogram bucket label for n"""
+    if n <= 1:
+        return str(n)
+    upper = 1 << (n - 1).bit_length()
+    return f"{upper // 2 + 1}-{upper}"
+
+class BatchScheduler:
+    """Collect concurrent translation requests and run them as shared batches
+    
+    Requests wait at most max_wait_ms for company; a batch is dispatched as
+    soon as it is full or the window closes, whichever comes first.
+    """
+    
+    def __init__(self, run_batch, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=BATCH_WAIT_MS):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self.queue_depths = Counter()
+        self.batches_run = 0
+        self.requests_served = 0
+        self._thread = None
+        self._pid = None
+    
+    def submit(self, text, target_lang):
+        """Queue one (text, target_lang) pair and return a Future for its translation"""
+        self._ensure_worker()
+        future = Future()
+        self.queue.put(((text, target_lang), future))
+        return future
+    
+    def translate(self, pairs, timeout=REQUEST_TIMEOUT):
+        """Submit pairs and block until all of them are translated"""
+        futures = [self.submit(text, target_lang) for text, target_lang in pairs]
+        return [future.result(timeout=timeout) for future in futures]
+    
+    def _ensure_worker(self):
+        # Threads do not survive fork, so restart the worker in a new process
+        with self.lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+            self._thread.start()
+    
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect()
+            with self.lock:
+                self.batch_sizes[len(batch)] += 1
+                self.queue_depths[_bucket(self.queue.qsize())] += 1
+                self.batches_run += 1
+                self.requests_served += len(batch)
+            
+            try:
+                results = self.run_batch([pair for pair, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+    
+    def get_stats(self):
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches_run": self.batches_run,
+                "requests_served": self.requests_served,
+                "mean_batch_size": round(self.requests_served / self.batches_run, 2) if self.batches_run else 0,
+                "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+                "queue_depth_histogram": dict(self.queue_depths)
+            }
 
-model.to("cpu")
-model.eval()
+scheduler = BatchScheduler(generate_batch)
 
-print("✅ Model loaded on CPU!")
-print("="*80)
+# ═══════════════════════════════════════════════════════════════════════════════
+# STARTUP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+WARMUP_WORDS = int(os.environ.get("SARVAM_WARMUP_WORDS", "3"))
+COMMON_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "common_words.json")
+
+STARTUP = {"stage": "waiting", "progress": 0.0, "error": None, "timings": {}}
+LOADED = threading.Event()
+READY = threading.Event()
+startup_lock = threading.Lock()
+_loader_pid = None
+
+def _stage(stage, progress):
+    STARTUP["stage"] = stage
+    STARTUP["progress"] = progress
+    print(f"⏳ [{progress:.0%}] {stage}...")
+
+def load_runtime():
+    """Import torch/transformers and load the tokenizer and model (blocking)"""
+    global tokenizer, model, MODEL_FOOTPRINT_MB, END_OF_ANSWER_IDS
+    if LOADED.is_set():
+        return
+    
+    started = time.time()
+    _stage("importing torch and transformers", 0.05)
+    import_runtime()
+    STARTUP["timings"]["import_s"] = round(time.time() - started, 2)
+    
+    if WORKERS > 1:
+        # Keep the parent from spinning up an OpenMP pool that forked children would inherit
+        torch.set_num_threads(1)
+    
+    print("="*80)
+    print(f"Loading Sarvam-Translate (CPU mode, {BACKEND})...")
+    print("="*80)
+    print(f"Device: CPU (avoiding CUDA issues)")
+    
+    started = time.time()
+    _stage("loading tokenizer", 0.15)
+    loaded_tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+    # Decoder-only model: pad on the left so every prompt ends right where generation starts
+    loaded_tokenizer.padding_side = "left"
+    if loaded_tokenizer.pad_token is None:
+        loaded_tokenizer.pad_token = loaded_tokenizer.eos_token
+    tokenizer = loaded_tokenizer
+    END_OF_ANSWER_IDS = _end_of_answer_ids()
+    
+    _stage(f"loading model ({BACKEND})", 0.25)
+    model = load_model(BACKEND)
+    MODEL_FOOTPRINT_MB = model_footprint(model) / 1024 / 1024
+    STARTUP["timings"]["load_s"] = round(time.time() - started, 2)
+    
+    print(f"✅ Model loaded on CPU! Backend: {BACKEND}, weights: {MODEL_FOOTPRINT_MB:.0f} MB, RSS: {process_rss_mb():.0f} MB")
+    print("="*80)
+    _stage("loaded", 0.8)
+    LOADED.set()
+
+def warmup_pairs(words_path=COMMON_WORDS_PATH, limit=WARMUP_WORDS):
+    """First few (english, language) pairs from common_words.json"""
+    try:
+        with open(words_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    pairs = []
+    for words in data.values():
+        for english, translations in words.items():
+            if len(pairs) >= limit:
+                return pairs
+            lang_key = next(iter(translations), "hindi")
+            pairs.append((english, lang_key.title()))
+    return pairs
+
+def warm_up():
+    """Per-process preparation before this process reports ready"""
+    started = time.time()
+    _stage("building prefix cache", 0.85)
+    prefix_cache.warm(list(LANGUAGE_SCRIPTS))
+    
+    _stage("warming up", 0.95)
+    for english, lang in warmup_pairs():
+        result = generate_batch([(english, lang)])[0]
+        print(f"🔥 Warm-up: {english} → {lang}: {result['translation']}")
+    STARTUP["timings"]["warmup_s"] = round(time.time() - started, 2)
+    STARTUP["timings"]["ready_after_s"] = round(time.time() - PROCESS_STARTED, 2)
+    
+    _stage("ready", 1.0)
+    print(f"✅ Ready: {STARTUP['timings']}")
+    READY.set()
+
+def _startup():
+    try:
+        load_runtime()
+        warm_up()
+    except Exception as e:
+        traceback.print_exc()
+        STARTUP["error"] = str(e)
+        STARTUP["stage"] = "failed"
+
+def start_background_load():
+    """Load and warm up the model on a background thread, once per process"""
+    global _loader_pid
+    with startup_lock:
+        if _loader_pid == os.getpid():
+            return
+        _loader_pid = os.getpid()
+    threading.Thread(target=_startup, name="model-loader", daemon=True).start()
+
+@app.before_request
+def _ensure_loading():
+    # Covers WSGI servers that import app without running __main__
+    if WORKERS <= 1 and not READY.is_set():
+        start_background_load()
+
+def _loading_response():
+    status = 500 if STARTUP["error"] else 503
+    error = STARTUP["error"] or "Model is still loading"
+    return jsonify({"success": False, "error": error, "stage": STARTUP["stage"], "progress": STARTUP["progress"]}), status
 
 @app.route('/translate', methods=['POST'])
 def translate():
+    if not READY.is_set():
+        return _loading_response()
     try:
         data = request.json
         text = data.get('text', '').strip()
@@ -43,51 +613,263 @@ def translate():
         print(f"\n{'='*60}")
         print(f"Translating: '{text}' → {target_lang}")
         
-        messages = [
-            {"role": "system", "content": f"Translate the text below to {target_lang}."},
-            {"role": "user", "content": text}
-        ]
+        result = scheduler.submit(text, target_lang).result(timeout=REQUEST_TIMEOUT)
         
-        prompt = tokenizer.apply_chat_template(
-            messages,
-            tokenize=False,
-            add_generation_prompt=True
-        )
+        print(f"✅ Result: {result['translation']} ({result['tokens_generated']} tokens, {result['prefill_saved_ms']} ms prefill saved)")
+        print('='*60)
         
-        inputs = tokenizer([prompt], return_tensors="pt")
+        return jsonify({
+            "success": True,
+            "translation": result["translation"],
+            "tokens_generated": result["tokens_generated"],
+            "prefill_saved_ms": result["prefill_saved_ms"],
+            "target_language": target_lang,
+            "source_text": text
+        })
+    
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/translate_batch', methods=['POST'])
+def translate_batch():
+    """Translate one or many texts into many languages in one forward pass
+    
+    Body: {"text": "..."} or {"texts": [...]}, plus {"target_languages": [...]}.
+    Every text is paired with every target language.
+    """
+    if not READY.is_set():
+        return _loading_response()
+    try:
+        data = request.json or {}
+        texts = data.get('texts') or [data.get('text', '')]
+        texts = [t.strip() for t in texts if t and t.strip()]
+        target_langs = data.get('target_languages') or ['Hindi']
         
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_new_tokens=256,
-                do_sample=True,
-                temperature=0.01,
-                num_return_sequences=1
-            )
+        pairs = [(text, lang) for text in texts for lang in target_langs]
+        if not pairs:
+            return jsonify({"success": False, "error": "No text to translate"}), 400
+        
+        print(f"\n{'='*60}")
+        print(f"Batch translating {len(texts)} text(s) × {len(target_langs)} language(s)")
         
-        generated = outputs[0][inputs['input_ids'].shape[1]:]
-        translation = tokenizer.decode(generated, skip_special_tokens=True).strip()
+        results = scheduler.translate(pairs)
         
-        print(f"✅ Result: {translation}")
+        print(f"✅ Translated {len(results)} pair(s), {sum(r['tokens_generated'] for r in results)} tokens")
         print('='*60)
         
         return jsonify({
             "success": True,
-            "translation": translation,
-            "target_language": target_lang,
-            "source_text": text
+            "translations": [
+                {"source_text": text, "target_language": lang, **result}
+                for (text, lang), result in zip(pairs, results)
+            ]
         })
     
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
 
+def generate_stream(text, target_lang, usage=None):
+    """Yield decoded text pieces for one translation as the model produces them
+    
+    If usage is a dict, usage["tokens_generated"] and usage["prefill_saved_ms"]
+    are filled in at the end.
+    """
+    pairs = [(text, target_lang)]
+    inputs, saved_ms = prefix_cache.inputs_for(text, target_lang)
+    if inputs is None:
+        inputs = tokenizer([build_prompt(text, target_lang)], return_tensors="pt")
+    prompt_len = inputs['input_ids'].shape[1]
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=REQUEST_TIMEOUT)
+    outputs = []
+    errors = []
+    
+    def run():
+        try:
+            with torch.no_grad():
+                outputs.append(model.generate(**inputs, streamer=streamer, **generation_kwargs(pairs, prompt_len)))
+        except Exception as e:
+            errors.append(e)
+            # Without the end signal the reader below would wait out REQUEST_TIMEOUT
+            streamer.end()
+    
+    thread = threading.Thread(target=run, name="generate-stream", daemon=True)
+    thread.start()
+    for piece in streamer:
+        if piece:
+            yield piece
+    thread.join()
+    if errors:
+        raise errors[0]
+    if outputs:
+        tokens = _count_generated(outputs[0][0][prompt_len:])
+        _record_tokens([tokens])
+        if usage is not None:
+            usage["tokens_generated"] = tokens
+            usage["prefill_saved_ms"] = round(saved_ms, 1)
+
+@app.route('/translate_stream', methods=['POST'])
+def translate_stream():
+    """Stream a translation as JSON lines: {"delta": ...} per piece, then {"done": true, ...}"""
+    if not READY.is_set():
+        return _loading_response()
+    data = request.json or {}
+    text = data.get('text', '').strip()
+    target_lang = data.get('target_language', 'Hindi')
+    
+    print(f"\n{'='*60}")
+    print(f"Streaming: '{text}' → {target_lang}")
+    
+    def events():
+        pieces = []
+        usage = {}
+        started = time.time()
+        try:
+            for piece in generate_stream(text, target_lang, usage):
+                if not pieces:
+                    print(f"⏱️ First token after {time.time() - started:.2f}s")
+                pieces.append(piece)
+                yield json.dumps({"delta": piece}, ensure_ascii=False) + "\n"
+            translation = _first_line("".join(pieces), text)
+            print(f"✅ Result: {translation}")
+            yield json.dumps({
+                "done": True,
+                "success": True,
+                "translation": translation,
+                "tokens_generated": usage.get("tokens_generated", 0),
+                "prefill_saved_ms": usage.get("prefill_saved_ms", 0.0),
+                "target_language": target_lang,
+                "source_text": text
+            }, ensure_ascii=False) + "\n"
+        except Exception as e:
+            traceback.print_exc()
+            yield json.dumps({"done": True, "success": False, "error": str(e)}) + "\n"
+    
+    return Response(stream_with_context(events()), mimetype="application/x-ndjson")
+
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "healthy", "model": "sarvam-translate", "device": "cpu"})
+    """Liveness plus loading progress; 200 while loading, 500 if loading failed"""
+    status = "failed" if STARTUP["error"] else "healthy" if READY.is_set() else "loading"
+    return jsonify({
+        "status": status,
+        "stage": STARTUP["stage"],
+        "progress": STARTUP["progress"],
+        "error": STARTUP["error"],
+        "timings": STARTUP["timings"],
+        "model": "sarvam-translate",
+        "device": "cpu",
+        "backend": BACKEND,
+        "weights_mb": round(MODEL_FOOTPRINT_MB, 1),
+        "peak_rss_mb": round(process_rss_mb(), 1)
+    }), 500 if STARTUP["error"] else 200
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once this worker can serve translations, 503 before"""
+    body = {
+        "ready": READY.is_set(),
+        "stage": STARTUP["stage"],
+        "pid": os.getpid(),
+        "torch_threads": torch.get_num_threads() if torch else None
+    }
+    return jsonify(body), 200 if READY.is_set() else 503
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    with generation_stats_lock:
+        generation = dict(GENERATION_STATS)
+    generation["mean_tokens_per_request"] = round(generation["tokens_generated"] / generation["requests"], 2) if generation["requests"] else 0
+    return jsonify({"scheduler": scheduler.get_stats(), "generation": generation, "prefix_cache": prefix_cache.get_stats()})
+
+def check_accuracy(words_path="data/common_words.json"):
+    """Compare the serving backend with fp32 on every word in common_words.json
+    
+    Reports how often the backend agrees with fp32 output and how often each
+    matches the reference translation stored in the file.
+    """
+    with open(words_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    pairs, references = [], []
+    for words in data.values():
+        for english, translations in words.items():
+            for lang_key, reference in translations.items():
+                pairs.append((english, lang_key.title()))
+                references.append(reference.strip())
+    
+    reference_model = model if BACKEND == "fp32" else load_model("fp32")
+    candidate, baseline = [], []
+    for start in range(0, len(pairs), MAX_BATCH_SIZE):
+        chunk = pairs[start:start + MAX_BATCH_SIZE]
+        candidate.extend(r["translation"] for r in generate_batch(chunk))
+        baseline.extend(r["translation"] for r in generate_batch(chunk, reference_model))
+    
+    total = len(pairs)
+    agree = sum(c == b for c, b in zip(candidate, baseline))
+    candidate_hits = sum(c == r for c, r in zip(candidate, references))
+    baseline_hits = sum(b == r for b, r in zip(baseline, references))
+    
+    print(f"\n{'='*60}")
+    print(f"Accuracy check: {BACKEND} vs fp32 on {total} word/language pairs")
+    print(f"  Agreement with fp32:    {agree}/{total} ({agree / total:.1%})")
+    print(f"  {BACKEND} matches dataset: {candidate_hits}/{total} ({candidate_hits / total:.1%})")
+    print(f"  fp32 matches dataset:   {baseline_hits}/{total} ({baseline_hits / total:.1%})")
+    for (english, lang), c, b in zip(pairs, candidate, baseline):
+        if c != b:
+            print(f"  ≠ {english} → {lang}: {BACKEND}='{c}' fp32='{b}'")
+    print('='*60)
+
+def serve_prefork(host="0.0.0.0", port=5000, workers=WORKERS):
+    """Serve with preforked gunicorn workers sharing the already-loaded model"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit("SARVAM_WORKERS > 1 needs gunicorn: pip install gunicorn")
+    
+    # Load before forking so every worker shares the parent's weight pages
+    load_runtime()
+    
+    def post_fork(server, worker):
+        torch.set_num_threads(THREADS_PER_WORKER)
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    
+    class SarvamApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "gthread")
+            # Several request threads per worker so the scheduler has something to batch
+            self.cfg.set("threads", MAX_BATCH_SIZE)
+            self.cfg.set("timeout", REQUEST_TIMEOUT)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("post_fork", post_fork)
+        
+        def load(self):
+            return app
+    
+    print(f"\n🚀 Server running: http://{host}:{port} ({workers} workers × {THREADS_PER_WORKER} torch threads)")
+    SarvamApplication().run()
 
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Sarvam-Translate API server")
+    parser.add_argument("--check-accuracy", action="store_true",
+                        help="compare SARVAM_BACKEND output with fp32 on data/common_words.json and exit")
+    args = parser.parse_args()
+    
+    if args.check_accuracy:
+        load_runtime()
+        check_accuracy()
+        raise SystemExit(0)
+    
+    if WORKERS > 1:
+        serve_prefork()
+        raise SystemExit(0)
+    
+    # Bind right away; /health reports progress while the model loads
+    start_background_load()
     print("\n🚀 Server running: http://localhost:5000")
     print("⚠️  CPU mode - slower but reliable\n")
     app.run(host='0.0.0.0', port=5000, debug=False)
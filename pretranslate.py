@@ -0,0 +1,250 @@
+"""
+Pre-translate
+Fill the dictionary offline from a wordlist, so words are translated before anyone searches them
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dictionary_builder import DictionaryBuilder, LANGUAGE_COLUMNS
+from dictionary_importer import READERS, upsert_rows
+from fallback_dictionary import is_translation
+from translator import SARVAM_LANGUAGES, UltimateTranslator
+
+CONCURRENCY = 4        # words translated at once (each is one /translate_batch call)
+FLUSH_EVERY = 200      # translated words per bulk insert + checkpoint
+REPORT_INTERVAL = 10   # seconds between progress lines
+
+def read_words(path):
+    """English words from a .txt wordlist (one per line) or any format dictionary_importer reads"""
+    reader = READERS.get(os.path.splitext(path)[1].lower())
+    if reader is not None:
+        for english, _, _ in reader(path):
+            if english:
+                yield english.strip().lower()
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and not word.startswith("#"):
+                yield word
+
+class Checkpoint:
+    """Position in the wordlist below which every word has been written
+
+    Words finish out of order; only the contiguous prefix counts, so a
+    resumed run may redo a few words but never skips one. The position
+    never moves past a word that failed, so a resumed run retries it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.position = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.position = json.load(f).get("position", 0)
+        self.finished = set()
+        self.failed_at = None
+
+    def finish(self, index):
+        if self.failed_at is not None and index > self.failed_at:
+            return
+        self.finished.add(index)
+        while self.position in self.finished:
+            self.finished.remove(self.position)
+            self.position += 1
+
+    def fail(self, index):
+        if self.failed_at is None or index < self.failed_at:
+            self.failed_at = index
+            self.finished = {i for i in self.finished if i < index}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"position": self.position, "saved_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+class Pretranslator:
+    """Stream a wordlist through UltimateTranslator into DictionaryBuilder"""
+
+    def __init__(self, builder, translator, languages=None, category="general",
+                 concurrency=CONCURRENCY, flush_every=FLUSH_EVERY):
+        self.builder = builder
+        self.translator = translator
+        self.languages = languages or SARVAM_LANGUAGES
+        self.category = category
+        self.concurrency = concurrency
+        self.flush_every = flush_every
+        self.pending_rows = []
+        self.lock = threading.Lock()
+        self.stats = {"words": 0, "skipped": 0, "translated": 0, "translations": 0, "failed": 0}
+
+    def missing_languages(self, words):
+        """{word: [languages not yet translated]} for a chunk of words; fully translated words are left out
+
+        Placeholder cells ("Translation unavailable", or the English word itself)
+        count as missing, and upsert_rows overwrites them.
+        """
+        existing = {}
+        for start in range(0, len(words), 500):
+            chunk = words[start:start + 500]
+            rows = self.builder.conn.execute(
+                f'SELECT english, {", ".join(LANGUAGE_COLUMNS)} FROM words WHERE english IN ({", ".join("?" * len(chunk))})',
+                chunk
+            ).fetchall()
+            existing.update((row[0], dict(zip(LANGUAGE_COLUMNS, row[1:]))) for row in rows)
+        missing = {}
+        for word in words:
+            record = existing.get(word, {})
+            langs = [lang for lang in self.languages if not is_translation(record.get(lang.lower()), word)]
+            if langs:
+                missing[word] = langs
+        return missing
+
+    def translate_word(self, word, languages):
+        """One row for upsert_rows, or None when nothing could be translated"""
+        results = self.translator.translate_many(word, languages)
+        translations = {lang.lower(): text for lang, (text, method) in results.items() if method != "none"}
+        if not translations:
+            return None, 0
+        # Empty category: words already in the dictionary keep theirs
+        return [word, ''] + [translations.get(col, '') for col in LANGUAGE_COLUMNS], len(translations)
+
+    def flush(self, checkpoint):
+        with self.lock:
+            rows, self.pending_rows = self.pending_rows, []
+        if rows:
+            with self.builder.conn:
+                upsert_rows(self.builder.conn, rows, self.category)
+        checkpoint.save()
+
+    def run(self, path, checkpoint, total=None):
+        """Translate every word of path past the checkpoint; returns the stats dict"""
+        started = time.perf_counter()
+        last_report = started
+        start_position = checkpoint.position
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pretranslate")
+        in_flight = {}
+        since_flush = 0
+
+        def chunks():
+            # Words arrive in chunks so the "already translated" check is one query per 500 words
+            chunk = []
+            for index, word in enumerate(read_words(path)):
+                if index < start_position:
+                    continue
+                chunk.append((index, word))
+                if len(chunk) == 500:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        def collect(done):
+            nonlocal since_flush
+            for future in done:
+                index, word = in_flight.pop(future)
+                try:
+                    row, count = future.result()
+                except Exception as e:
+                    print(f"⚠️ {word}: {e}")
+                    row, count = None, 0
+                if row is None:
+                    self.stats["failed"] += 1
+                    checkpoint.fail(index)
+                else:
+                    with self.lock:
+                        self.pending_rows.append(row)
+                    self.stats["translated"] += 1
+                    self.stats["translations"] += count
+                    since_flush += 1
+                    checkpoint.finish(index)
+                self.stats["words"] += 1
+
+        try:
+            for chunk in chunks():
+                missing = self.missing_languages([word for _, word in chunk])
+                for index, word in chunk:
+                    if word not in missing:
+                        self.stats["skipped"] += 1
+                        self.stats["words"] += 1
+                        checkpoint.finish(index)
+                        continue
+                    # Bounded window: never more than 2x concurrency words queued
+                    while len(in_flight) >= 2 * self.concurrency:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    in_flight[executor.submit(self.translate_word, word, missing[word])] = (index, word)
+
+                    if since_flush >= self.flush_every:
+                        self.flush(checkpoint)
+                        since_flush = 0
+                    if time.perf_counter() - last_report >= REPORT_INTERVAL:
+                        self.report(started, total, start_position)
+                        last_report = time.perf_counter()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            # Ctrl-C or a crash still keeps everything translated so far
+            self.flush(checkpoint)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.report(started, total, start_position)
+        return dict(self.stats, seconds=round(time.perf_counter() - started, 1))
+
+    def report(self, started, total, start_position):
+        elapsed = time.perf_counter() - started
+        rate = self.stats["words"] / elapsed if elapsed else 0.0
+        line = (f"📊 {start_position + self.stats['words']:,}"
+                + (f"/{total:,}" if total else "")
+                + f" words | {rate:,.1f} words/s | translated {self.stats['translated']:,}"
+                + f" | skipped {self.stats['skipped']:,} | failed {self.stats['failed']:,}")
+        if total and rate:
+            remaining = max(0, total - start_position - self.stats["words"]) / rate
+            line += f" | ETA {time.strftime('%H:%M:%S', time.gmtime(remaining))}"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-translate a wordlist into the dictionary")
+    parser.add_argument("wordlist", help="words to translate (.txt one per line, or .json/.jsonl/.csv)")
+    parser.add_argument("--db", default="data/dictionary.db", help="dictionary database")
+    parser.add_argument("--url", action="append", help="Sarvam server URL (repeat for replicas; default: secrets)")
+    parser.add_argument("--languages", help="comma-separated languages (default: all 22)")
+    parser.add_argument("--category", default="general", help="category for new words")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="words translated at once")
+    parser.add_argument("--flush-every", type=int, default=FLUSH_EVERY, help="words per bulk insert")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <wordlist>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or args.wordlist + ".checkpoint"
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path)
+    if checkpoint.position:
+        print(f"↩️ Resuming after word {checkpoint.position:,}")
+
+    languages = None
+    if args.languages:
+        languages = [lang.strip().title() for lang in args.languages.split(",") if lang.strip()]
+
+    total = sum(1 for _ in read_words(args.wordlist))
+    db = DictionaryBuilder(args.db)
+    translator = UltimateTranslator(api_urls=args.url)
+    pretranslator = Pretranslator(db, translator, languages, args.category, args.concurrency, args.flush_every)
+    try:
+        stats = pretranslator.run(args.wordlist, checkpoint, total)
+        print(f"✅ Done: {stats['translated']:,} words translated, {stats['skipped']:,} already complete, "
+              f"{stats['failed']:,} failed in {stats['seconds']}s")
+        if stats["failed"]:
+            print(f"↩️ Checkpoint kept at word {checkpoint.position:,} - run again to retry the failed words")
+    except KeyboardInterrupt:
+        print(f"⏸️ Stopped at word {checkpoint.position:,} - run again to resume")
+    finally:
+        db.close()
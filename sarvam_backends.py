@@ -0,0 +1,207 @@
+"""Load balancing, circuit breaking and request hedging across Sarvam servers"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import math
+import random
+import threading
+import time
+
+class NoHealthyBackend(Exception):
+    """Every backend's circuit breaker is open"""
+
+class SarvamBackend:
+    """One Sarvam server with a circuit breaker and a window of recent latencies
+
+    After failure_threshold consecutive failures the breaker opens and the
+    backend is skipped. Once reset_timeout seconds pass, a single probe
+    request is let through (half-open); success closes the breaker again,
+    failure re-opens it.
+    """
+
+    def __init__(self, url, failure_threshold=3, reset_timeout=30, window=200):
+        self.url = url.rstrip("/")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latencies = deque(maxlen=window)
+        self.ewma_ms = None
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.inflight = 0
+        self.stats = {"calls": 0, "failures": 0, "skipped": 0}
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def acquire(self):
+        """Claim a request slot; False while the breaker is open or already probing"""
+        with self.lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self.probing):
+                self.stats["skipped"] += 1
+                return False
+            if state == "half-open":
+                self.probing = True
+            self.inflight += 1
+            self.stats["calls"] += 1
+            return True
+
+    def release(self, elapsed_ms, ok):
+        with self.lock:
+            self.inflight -= 1
+            self.probing = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                self.latencies.append(elapsed_ms)
+                self.ewma_ms = elapsed_ms if self.ewma_ms is None else 0.8 * self.ewma_ms + 0.2 * elapsed_ms
+                return
+            self.failures += 1
+            self.stats["failures"] += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.time()
+
+    def weight(self):
+        """Faster, less busy backends get proportionally more traffic"""
+        with self.lock:
+            return 1.0 / ((self.ewma_ms or 100.0) * (1 + self.inflight))
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, url=self.url, state=self.state, inflight=self.inflight,
+                        ewma_ms=round(self.ewma_ms or 0, 1))
+
+class BackendPool:
+    """Send each request to a health-weighted backend, hedging slow ones
+
+    If the chosen backend has not answered within the hedge_percentile of
+    recently observed latencies, the same request goes to a second backend
+    and whichever succeeds first wins. A failure on the first backend fails
+    over to a second one straight away.
+    """
+
+    def __init__(self, urls, failure_threshold=3, reset_timeout=30, hedge_percentile=95,
+                 min_samples=20, max_workers=32):
+        self.backends = [SarvamBackend(url, failure_threshold, reset_timeout) for url in urls if url]
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sarvam-backend")
+        self.stats = {"hedges": 0, "hedge_wins": 0, "failovers": 0}
+        self.lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.backends)
+
+    def _choose(self, exclude=()):
+        candidates = [b for b in self.backends if b not in exclude]
+        # Weighted random order (Efraimidis-Spirakis keys); recovering backends get their probe first
+        candidates.sort(key=lambda b: (b.state != "half-open", -math.log(1.0 - random.random()) / b.weight()))
+        for backend in candidates:
+            if backend.acquire():
+                return backend
+        return None
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, or None until there is enough history"""
+        samples = sorted(ms for b in self.backends for ms in list(b.latencies))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))
+        return samples[index] / 1000
+
+    def _attempt(self, backend, send):
+        started = time.perf_counter()
+        try:
+            response = send(backend.url)
+        except Exception:
+            backend.release((time.perf_counter() - started) * 1000, ok=False)
+            raise
+        ok = response.status_code < 500
+        backend.release((time.perf_counter() - started) * 1000, ok)
+        return response
+
+    def call(self, send, hedge=True):
+        """Run send(base_url) -> response on the best backend
+
+        A response with status < 500 counts as success. Returns the first
+        successful response, else the last failed one, else raises the last
+        error (NoHealthyBackend if no backend would take the request).
+        """
+        primary = self._choose()
+        if primary is None:
+            raise NoHealthyBackend("All Sarvam backends are unavailable")
+
+        pending = {self.executor.submit(self._attempt, primary, send): primary}
+        tried = {primary}
+        hedged = set()
+        hedge_at = None
+        delay = self.hedge_delay() if hedge and len(self.backends) > 1 else None
+        if delay is not None:
+            hedge_at = time.monotonic() + delay
+
+        last_response, last_error = None, None
+        while pending:
+            timeout = None if hedge_at is None else max(0, hedge_at - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Primary is slower than usual - hedge on another backend
+                hedge_at = None
+                backend = self._choose(exclude=tried)
+                if backend is not None:
+                    tried.add(backend)
+                    hedged.add(backend)
+                    pending[self.executor.submit(self._attempt, backend, send)] = backend
+                    with self.lock:
+                        self.stats["hedges"] += 1
+                continue
+
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    response = None
+                if response is not None and response.status_code < 500:
+                    if backend in hedged:
+                        with self.lock:
+                            self.stats["hedge_wins"] += 1
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    return response
+                if response is not None:
+                    last_response = response
+
+            if not pending:
+                # Everything in flight failed - fail over to an untried backend
+                backend = self._choose(exclude=tried)
+                if backend is not None:
+                    tried.add(backend)
+                    hedge_at = None
+                    pending[self.executor.submit(self._attempt, backend, send)] = backend
+                    with self.lock:
+                        self.stats["failovers"] += 1
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+        stats["backends"] = [b.get_stats() for b in self.backends]
+        return stats
+
+def _close_response(future):
+    """Release the connection of a hedged request that lost the race"""
+    try:
+        future.result().close()
+    except Exception:
+        pass
@@ -0,0 +1,127 @@
+"""Two-tier translation cache: in-process LRU in front of a SQLite store"""
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+def normalize_text(text):
+    """Cache key form of text: NFC, lowercased, whitespace collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+class TranslationCache:
+    """Cache translations by (normalized text, target language, model version)
+
+    Tier 1 is an LRU dict bounded by max_size and memory_ttl seconds.
+    Tier 2 is a SQLite table that survives restarts; disk_ttl=None keeps
+    entries forever.
+    """
+
+    def __init__(self, db_path="data/translation_cache.db", model_version="sarvam-translate",
+                 max_size=10000, memory_ttl=3600, disk_ttl=30 * 24 * 3600):
+        self.db_path = db_path
+        self.model_version = model_version
+        self.max_size = max_size
+        self.memory_ttl = memory_ttl
+        self.disk_ttl = disk_ttl
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.conn = None
+        try:
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    text TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (text, language, model_version)
+                )
+            ''')
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache disk tier disabled: {e}")
+            self.conn = None
+
+    def _key(self, text, language):
+        return (normalize_text(text), language, self.model_version)
+
+    def get(self, text, language):
+        """Return the cached translation, or None on a miss"""
+        return self._get(text, language, count=True)
+
+    def peek(self, text, language):
+        """Like get(), but not counted in the hit/miss stats (for re-checks of a counted miss)"""
+        return self._get(text, language, count=False)
+
+    def _get(self, text, language, count):
+        key = self._key(text, language)
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                translation, stored_at = entry
+                if now - stored_at <= self.memory_ttl:
+                    self.memory.move_to_end(key)
+                    if count:
+                        self.stats["memory_hits"] += 1
+                    return translation
+                del self.memory[key]
+
+            row = None
+            if self.conn is not None:
+                try:
+                    row = self.conn.execute(
+                        'SELECT translation, created_at FROM translations WHERE text = ? AND language = ? AND model_version = ?',
+                        key
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+            if row and (self.disk_ttl is None or now - row[1] <= self.disk_ttl):
+                self._remember(key, row[0], now)
+                if count:
+                    self.stats["disk_hits"] += 1
+                return row[0]
+
+            if count:
+                self.stats["misses"] += 1
+            return None
+
+    def put(self, text, language, translation):
+        """Store a translation in both tiers"""
+        if not translation:
+            return
+        key = self._key(text, language)
+        now = time.time()
+        with self.lock:
+            self._remember(key, translation, now)
+            if self.conn is not None:
+                try:
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO translations (text, language, model_version, translation, created_at) VALUES (?, ?, ?, ?, ?)',
+                        key + (translation, now)
+                    )
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Translation cache write failed: {e}")
+
+    def _remember(self, key, translation, stored_at):
+        self.memory[key] = (translation, stored_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    def get_stats(self):
+        with self.lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return dict(self.stats, hits=hits, memory_size=len(self.memory))
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
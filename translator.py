@@ -1,50 +1,293 @@
 """🌍 SARVAM-TRANSLATE via Local API"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import random
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from fallback_dictionary import FallbackDictionary
+from sarvam_backends import BackendPool, NoHealthyBackend
+from translation_cache import TranslationCache, normalize_text
+from utils.singleflight import SingleFlight
 
 SARVAM_LANGUAGES = ["Hindi", "Bengali", "Tamil", "Telugu", "Malayalam", "Kannada", "Marathi", "Gujarati", "Odia", "Punjabi", "Assamese", "Urdu", "Maithili", "Sanskrit", "Konkani", "Nepali", "Sindhi", "Dogri", "Manipuri", "Bodo", "Kashmiri", "Santali"]
 
 class UltimateTranslator:
-    def __init__(self, sarvam_api_key=None, huggingface_token=None, gemini_api_key=None):
+    def __init__(self, sarvam_api_key=None, huggingface_token=None, gemini_api_key=None, api_urls=None):
         try:
             import streamlit as st
-            self.api_url = st.secrets.get("local_api", {}).get("sarvam_url", "")
+            local_api = st.secrets.get("local_api", {})
+            # sarvam_urls lists replicas; a lone sarvam_url still works
+            self.api_urls = list(local_api.get("sarvam_urls", [])) or [local_api.get("sarvam_url", "")]
+            self.model_version = local_api.get("model_version", "sarvam-translate")
+            self.max_concurrency = int(local_api.get("max_concurrency", len(SARVAM_LANGUAGES)))
+            self.pool_size = int(local_api.get("pool_size", self.max_concurrency))
+            self.connect_timeout = float(local_api.get("connect_timeout", 3.05))
+            self.read_timeout = float(local_api.get("read_timeout", 30))
+            self.max_retries = int(local_api.get("max_retries", 2))
+            self.failure_threshold = int(local_api.get("failure_threshold", 3))
+            self.reset_timeout = float(local_api.get("reset_timeout", 30))
+            self.hedge_percentile = float(local_api.get("hedge_percentile", 95))
         except:
-            self.api_url = ""
+            self.api_urls = []
+            self.model_version = "sarvam-translate"
+            self.max_concurrency = len(SARVAM_LANGUAGES)
+            self.pool_size = self.max_concurrency
+            self.connect_timeout = 3.05
+            self.read_timeout = 30
+            self.max_retries = 2
+            self.failure_threshold = 3
+            self.reset_timeout = 30
+            self.hedge_percentile = 95
+        if api_urls:
+            # Explicit servers (e.g. from a command-line job) win over secrets
+            self.api_urls = list(api_urls)
+        self.api_urls = [url for url in self.api_urls if url]
+        self.api_url = self.api_urls[0] if self.api_urls else ""
+        self.backends = BackendPool(
+            self.api_urls,
+            failure_threshold=self.failure_threshold,
+            reset_timeout=self.reset_timeout,
+            hedge_percentile=self.hedge_percentile,
+            max_workers=2 * self.max_concurrency
+        )
+        # One keep-alive connection pool per Sarvam server for every call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(1, len(self.api_urls)), pool_maxsize=self.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.latency = {"calls": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0}
+        self.cache = TranslationCache(model_version=self.model_version)
+        # Bundled dataset, consulted before any network call
+        self.fallback = FallbackDictionary()
+        # Shared by every session; the server micro-batches the concurrent calls
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="translate")
         self.stats = {"sarvam": 0, "fallback": 0}
-        print(f"🌍 Sarvam: {'✅' if self.api_url else '❌'}")
+        # Concurrent misses on the same text share one model call
+        self.flights = SingleFlight()
+        self.stats_lock = threading.Lock()
+        print(f"🌍 Sarvam: {'✅' if self.api_url else '❌'} ({len(self.api_urls)} backend(s))")
+    
+    def _post(self, path, payload, read_timeout=None, stream=False):
+        """POST to a Sarvam server over the pooled session
+        
+        The backend pool picks a replica, skips ones whose circuit breaker
+        is open and hedges slow non-streaming calls. 5xx responses and
+        connection failures are retried with jittered exponential backoff;
+        read timeouts are not, since the server may still be generating.
+        """
+        timeout = (self.connect_timeout, read_timeout or self.read_timeout)
+        
+        def send(base_url):
+            return self.session.post(f"{base_url}{path}", json=payload, timeout=timeout, stream=stream)
+        
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self.backends.call(send, hedge=not stream)
+                error = None
+            except requests.exceptions.ConnectionError as e:
+                response, error = None, e
+            except (requests.exceptions.RequestException, NoHealthyBackend):
+                self._record_latency(started, failed=True)
+                raise
+            failed = response is None or response.status_code >= 500
+            self._record_latency(started, failed)
+            if not failed or attempt == self.max_retries:
+                break
+            if response is not None:
+                response.close()
+            with self.stats_lock:
+                self.latency["retries"] += 1
+            time.sleep(0.2 * 2 ** attempt * random.uniform(0.5, 1.5))
+        if response is None:
+            raise error
+        return response
+    
+    def _record_latency(self, started, failed=False):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self.stats_lock:
+            self.latency["calls"] += 1
+            self.latency["total_ms"] += elapsed_ms
+            self.latency["max_ms"] = max(self.latency["max_ms"], elapsed_ms)
+            if failed:
+                self.latency["errors"] += 1
     
     def translate_sarvam(self, text, target_language):
         if not self.api_url or target_language not in SARVAM_LANGUAGES:
             return None
         try:
-            response = requests.post(f"{self.api_url}/translate", json={"text": text, "target_language": target_language}, timeout=30)
+            response = self._post("/translate", {"text": text, "target_language": target_language})
             if response.status_code == 200:
                 result = response.json()
                 if result.get('success'):
-                    self.stats["sarvam"] += 1
+                    self._count("sarvam")
                     return result.get('translation', '').strip()
-        except: pass
+        except Exception as e:
+            print(f"⚠️ Sarvam /translate failed for {target_language}: {e}")
         return None
     
     def translate_fallback(self, text, target_language):
-        words = {"hello": {"Hindi": "नमस्ते"}, "potato": {"Hindi": "आलू"}}
-        if text.lower() in words and target_language in words[text.lower()]:
-            self.stats["fallback"] += 1
-            return words[text.lower()][target_language]
-        return None
+        result = self.fallback.lookup(text, target_language)
+        if result:
+            self._count("fallback")
+        return result
     
     def translate(self, text, target_language):
         text = text.strip()
         if not text: return "", "none"
-        result = self.translate_sarvam(text, target_language)
+        result = self.cache.get(text, target_language)
         if result: return result, "sarvam"
         result = self.translate_fallback(text, target_language)
         if result: return result, "fallback"
+        return self.flights.do(("translate", normalize_text(text), target_language), self._translate_uncached, text, target_language)
+    
+    def _translate_uncached(self, text, target_language):
+        # A flight that finished just before this one started may have filled the cache
+        result = self.cache.peek(text, target_language)
+        if result: return result, "sarvam"
+        result = self.translate_sarvam(text, target_language)
+        if result:
+            self.cache.put(text, target_language, result)
+            return result, "sarvam"
+        # Last resort, shown but never cached: the singular's translation for a regular plural
+        result = self.fallback.lookup_plural(text, target_language)
+        if result: return result, "approximate"
         return "Translation unavailable", "none"
     
+    def translate_sarvam_batch(self, text, target_languages):
+        """Translate one text into many languages with a single /translate_batch call"""
+        langs = [lang for lang in target_languages if lang in SARVAM_LANGUAGES]
+        if not self.api_url or not langs:
+            return {}
+        try:
+            response = self._post("/translate_batch", {"text": text, "target_languages": langs}, read_timeout=self.read_timeout + 5 * len(langs))
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('success'):
+                    translations = {}
+                    for item in result.get('translations', []):
+                        translation = item.get('translation', '').strip()
+                        if translation:
+                            translations[item.get('target_language')] = translation
+                    self._count("sarvam", len(translations))
+                    return translations
+        except Exception as e:
+            print(f"⚠️ Sarvam /translate_batch failed: {e}")
+        return {}
+    
+    def translate_many(self, text, target_languages):
+        """Translate text into every language in target_languages
+        
+        Returns {language: (translation, method)} in the same shape as translate().
+        """
+        text = text.strip()
+        if not text: return {lang: ("", "none") for lang in target_languages}
+        key = ("translate_many", normalize_text(text), tuple(target_languages))
+        return self.flights.do(key, self._translate_many_uncached, text, list(target_languages))
+    
+    def _translate_many_uncached(self, text, target_languages):
+        cached, local = {}, {}
+        for lang in target_languages:
+            result = self.cache.get(text, lang)
+            if result:
+                cached[lang] = result
+                continue
+            result = self.translate_fallback(text, lang)
+            if result: local[lang] = result
+        batch = self.translate_sarvam_batch(text, [lang for lang in target_languages if lang not in cached and lang not in local])
+        for lang, result in batch.items():
+            self.cache.put(text, lang, result)
+        results = {}
+        for lang in target_languages:
+            if lang in local:
+                results[lang] = (local[lang], "fallback")
+            elif lang in cached or lang in batch:
+                results[lang] = (cached.get(lang) or batch[lang], "sarvam")
+            else:
+                results[lang] = ("Translation unavailable", "none")
+        return results
+    
+    def translate_stream(self, text, target_language):
+        """Yield the translation so far as the server streams tokens
+        
+        Falls back to a single translate() result when streaming is unavailable.
+        """
+        text = text.strip()
+        if not text: return
+        cached = self.cache.get(text, target_language) or self.translate_fallback(text, target_language)
+        if cached:
+            yield cached
+            return
+        partial = ""
+        if self.api_url and target_language in SARVAM_LANGUAGES:
+            try:
+                with self._post("/translate_stream", {"text": text, "target_language": target_language}, stream=True) as response:
+                    if response.status_code == 200:
+                        for line in response.iter_lines(decode_unicode=True):
+                            if not line: continue
+                            event = json.loads(line)
+                            if event.get("done"):
+                                if event.get("success"):
+                                    translation = event.get("translation", "").strip()
+                                    if translation:
+                                        self._count("sarvam")
+                                        self.cache.put(text, target_language, translation)
+                                        yield translation
+                                        return
+                                break
+                            partial += event.get("delta", "")
+                            yield partial
+            except Exception as e:
+                print(f"⚠️ Sarvam /translate_stream failed for {target_language}: {e}")
+        # The cache and fallback were already checked above
+        key = ("translate", normalize_text(text), target_language)
+        result, _ = self.flights.do(key, self._translate_uncached, text, target_language)
+        yield result
+    
+    def iter_translations(self, text, target_languages):
+        """Translate into all target_languages at once, yielding (language, translation, method) as each finishes
+        
+        Wall-clock time is bounded by the slowest language rather than the sum.
+        """
+        futures = {self.executor.submit(self.translate, text, lang): lang for lang in target_languages}
+        for future in as_completed(futures):
+            lang = futures[future]
+            try:
+                result, method = future.result()
+            except Exception:
+                result, method = "Translation unavailable", "none"
+            yield lang, result, method
+    
+    def _count(self, tier, n=1):
+        with self.stats_lock:
+            self.stats[tier] += n
+    
     def get_stats(self):
-        total = sum(self.stats.values())
-        return f"Sarvam: {self.stats['sarvam']} | Fallback: {self.stats['fallback']}" if total else "No translations yet"
+        cache = self.cache.get_stats()
+        flights = self.flights.get_stats()
+        local = self.fallback.get_stats()
+        total = sum(self.stats.values()) + cache["hits"]
+        if not total:
+            return "No translations yet"
+        with self.stats_lock:
+            latency = dict(self.latency)
+        avg_ms = latency["total_ms"] / latency["calls"] if latency["calls"] else 0
+        return (
+            f"Sarvam: {self.stats['sarvam']} | Fallback: {self.stats['fallback']} (common words {local['common_words']}, dictionary {local['dictionary']}, plurals {local['plurals']}) | Cache hits: {cache['hits']} | Cache misses: {cache['misses']} | Coalesced: {flights['shared']}\n"
+            f"HTTP calls: {latency['calls']} | Avg: {avg_ms:.0f} ms | Max: {latency['max_ms']:.0f} ms | Errors: {latency['errors']} | Retries: {latency['retries']}\n"
+            + self._backend_stats()
+        )
+    
+    def _backend_stats(self):
+        pool = self.backends.get_stats()
+        lines = [f"Hedges: {pool['hedges']} (won {pool['hedge_wins']}) | Failovers: {pool['failovers']}"]
+        for backend in pool["backends"]:
+            lines.append(f"{backend['url']}: {backend['state']} | {backend['ewma_ms']:.0f} ms | calls {backend['calls']} | failures {backend['failures']}")
+        return "\n".join(lines)
 
 _translator = None
 def get_translator(sarvam_api_key=None, huggingface_token=None, gemini_api_key=None):
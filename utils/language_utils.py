@@ -1,4 +1,5 @@
 """Language utilities for 22 Indian languages"""
+import unicodedata
 
 def get_all_languages():
     """Return list of all 22 Indian languages"""
@@ -36,3 +37,26 @@ def get_language_display_name(language):
         "Santali": "ᱥᱟᱱᱛᱟᱲᱤ"
     }
     return native_names.get(language, language)
+
+# Characters that change how a word renders but not which word it is
+_FOLD_DROP = {
+    0x200C, 0x200D,                                           # ZWNJ, ZWJ
+    0x093C, 0x09BC, 0x0A3C, 0x0ABC, 0x0B3C, 0x0CBC,           # nukta (Indic scripts)
+    0x0640,                                                   # Arabic tatweel
+    *range(0x064B, 0x0660), 0x0670,                           # Arabic harakat, superscript alef
+}
+_FOLD_MAP = {
+    0x0901: 0x0902,  # Devanagari chandrabindu -> anusvara
+    0x0981: 0x0982,  # Bengali chandrabindu -> anusvara
+    0x064A: 0x06CC,  # Arabic yeh -> Farsi yeh (Urdu, Kashmiri)
+    0x0649: 0x06CC,  # alef maksura -> Farsi yeh
+    0x0643: 0x06A9,  # Arabic kaf -> keheh
+    0x06C1: 0x0647,  # heh goal -> heh
+}
+_FOLD_TABLE = {**{c: None for c in _FOLD_DROP}, **_FOLD_MAP}
+
+def fold_native(text):
+    """Match key for a native-script word: NFC, spelling variants folded, case and spaces normalized"""
+    # NFD first so precomposed nukta letters (e.g. क़) split into base + nukta
+    text = unicodedata.normalize("NFD", text).translate(_FOLD_TABLE)
+    return " ".join(unicodedata.normalize("NFC", text).casefold().split())
@@ -0,0 +1,50 @@
+"""Request coalescing: concurrent calls with the same key share one execution"""
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Run fn once per key at a time; callers that arrive meanwhile wait for its result
+
+    Exceptions are re-raised in every waiting caller. Nothing is cached once
+    the call finishes - the next caller starts a fresh execution.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.stats = {"executions": 0, "shared": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.stats["executions"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, in_flight=len(self.calls))